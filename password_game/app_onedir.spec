@@ -0,0 +1,55 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Startup-optimized app: unpacked into a folder instead of a temp dir on every launch,
+# without the modules import_audit.py found the game never imports, and without UPX,
+# which would have every DLL decompressed at load time.
+import json
+import os
+
+try:
+    with open(os.path.join(SPECPATH, 'bundle_excludes.json')) as f:
+        excludes = json.load(f)['excludes']
+except (OSError, ValueError, KeyError):
+    excludes = []
+
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('changelog.json', '.')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='app',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='app_onedir',
+)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Project Zozfil
+Runs the game headless with scripted input and reports frame times as JSON.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from percentiles import percentile
+
+# Configuration
+DEFAULT_REPEAT = 3
+DEFAULT_IDLE_FRAMES = 120  # Frames spent sitting on each screen without input
+DEFAULT_TOLERANCE = 0.2  # Allowed p95 slowdown against a baseline
+MIN_REGRESSION_MS = 0.5  # Ignore slowdowns smaller than this, sub-millisecond timings are noisy
+
+def get_peak_rss_kb():
+    """Get the peak resident set size of this process, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Bytes on macOS, KB elsewhere
+
+def build_script(game, idle_frames):
+    """Yield the events for each frame: menus, typing, pausing, scrolling and resizing."""
+    import pygame
+
+    def idle():
+        for _ in range(idle_frames):
+            yield []
+
+    def click(layout_name, action):
+        for button in game.get_layout(layout_name).buttons:
+            if button.action == action:
+                return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=button.rect.center, button=1)]
+        raise ValueError(f"No {action} button in the {layout_name} layout")
+
+    def key(key_code, text=""):
+        return [pygame.event.Event(pygame.KEYDOWN, key=key_code, unicode=text, mod=0, scancode=0)]
+
+    def resize(width, height):
+        return [pygame.event.Event(pygame.VIDEORESIZE, size=(width, height), w=width, h=height)]
+
+    # Main menu
+    yield from idle()
+
+    # Changelogs, scrolled to the bottom and back up
+    yield click("menu", "changelogs")
+    for direction in (-1, 1):
+        for _ in range(20):
+            yield [pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=direction, flipped=False)]
+    yield from idle()
+    yield click("changelogs", "back")
+
+    # Settings
+    yield click("menu", "settings")
+    yield from idle()
+    yield click("settings", "back")
+
+    # Wrong guesses until game over, pausing partway through
+    yield click("menu", "play")
+    for guess_number in range(game.session.max_guesses):
+        for char in "wrong!":
+            yield key(ord(char), char)
+        yield key(pygame.K_RETURN, "\r")
+        if guess_number == 2:
+            yield key(pygame.K_ESCAPE)
+            yield from idle()
+            yield key(pygame.K_ESCAPE)
+    yield from idle()
+    yield click("game_over", "back")
+
+    # Resized window
+    yield resize(1280, 720)
+    yield from idle()
+    yield resize(800, 600)
+    yield from idle()
+
+def run_benchmark(repeat, idle_frames):
+    """Play the input script and collect frame times per game state."""
+    import pygame
+    import main as game
+
+    state_names = {
+        game.MENU: "menu",
+        game.PLAYING: "playing",
+        game.SETTINGS: "settings",
+        game.PAUSED: "paused",
+        game.CHANGELOGS: "changelogs",
+    }
+    frame_times = {name: [] for name in state_names.values()}
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for events in build_script(game, idle_frames):
+            frame_start = time.perf_counter()
+            for event in events:
+                pygame.event.post(event)
+            game.run_frame(pygame.event.get())
+            frame_times[state_names[game.current_state]].append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+
+    total_frames = sum(len(times) for times in frame_times.values())
+    states = {}
+    for name, times in frame_times.items():
+        if not times:
+            continue
+        ordered = sorted(times)
+        states[name] = {
+            "frames": len(times),
+            "mean_ms": round(sum(times) / len(times) * 1000, 3),
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+            "max_ms": round(max(times) * 1000, 3),
+        }
+
+    return {
+        "render_mode": game.RENDER_MODE,
+        "particles": game.particles.count,
+        "frames": total_frames,
+        "seconds": round(elapsed, 3),
+        "fps": round(total_frames / elapsed, 1),
+        "peak_rss_kb": get_peak_rss_kb(),
+        "states": states,
+    }
+
+def find_regressions(results, baseline, tolerance):
+    """List the states whose p95 frame time grew by more than tolerance."""
+    regressions = []
+    for name, stats in baseline.get("states", {}).items():
+        current = results["states"].get(name)
+        if not current:
+            continue
+        slowdown = current["p95_ms"] - stats["p95_ms"]
+        if slowdown > stats["p95_ms"] * tolerance and slowdown > MIN_REGRESSION_MS:
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms vs baseline {stats['p95_ms']} ms")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Project Zozfil game loop headlessly.")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="times to play the input script")
+    parser.add_argument("--idle-frames", type=int, default=DEFAULT_IDLE_FRAMES, help="frames spent on each screen")
+    parser.add_argument("--render-mode", choices=("dirty", "flip", "texture"), help="override ZOZFIL_RENDER_MODE")
+    parser.add_argument("--particles", type=int, help="override ZOZFIL_PARTICLES")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare p95 frame times against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed p95 slowdown, e.g. 0.2 for 20%%")
+    args = parser.parse_args()
+
+    # The game reads these when it is imported
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    if args.render_mode:
+        os.environ["ZOZFIL_RENDER_MODE"] = args.render_mode
+    if args.particles is not None:
+        os.environ["ZOZFIL_PARTICLES"] = str(args.particles)
+
+    # Anything the game prints goes to stderr, stdout is only the report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run_benchmark(args.repeat, args.idle_frames)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
@@ -5,42 +5,191 @@ Converts Python scripts into standalone executables using PyInstaller.
 """
 
 import os
-import subprocess
+import sys
+import ast
+import json
+import time
 import shutil
+import hashlib
+import tempfile
+import argparse
+import platform
+import subprocess
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
+
+# Configuration
+BUILD_DIR = "build"  # PyInstaller's analysis cache, one work directory per target
+DIST_DIR = "dist"
+FINGERPRINT_FILE = os.path.join(BUILD_DIR, "fingerprints.json")
+EXE_SUFFIX = ".exe" if os.name == "nt" else ""
+TARGETS = {
+    "app": {"spec": "app.spec", "script": "main.py", "data": ["changelog.json"]},
+    # "excludes" must match the spec's, the build refuses sources that import them
+    "updater": {"spec": "updater.spec", "script": "updater.py", "data": [], "excludes": ["numpy"]},
+    # Startup-optimized app in a folder, "exe" names the executable inside it. Its trimmed
+    # bundle only counts as built once a headless launch has drawn every screen.
+    "app_onedir": {"spec": "app_onedir.spec", "script": "main.py", "data": ["changelog.json", "bundle_excludes.json"], "exe": "app", "smoke_test": True},
+}
+SMOKE_TEST_TIMEOUT = 60  # Seconds a smoke-test launch may take
+
+def imported_names(path):
+    """List the top-level modules a source file imports, in function bodies too, so imports done lazily still count."""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            names.append(node.module)
+    return [name.split(".")[0] for name in names]
+
+def local_sources(script):
+    """Find script and every module of this project it imports, directly or not."""
+    sources = set()
+    pending = [script]
+    while pending:
+        path = pending.pop()
+        if path in sources or not os.path.exists(path):
+            continue
+        sources.add(path)
+        pending.extend(f"{name}.py" for name in imported_names(path))
+    return sorted(sources)
+
+def excluded_imports(name):
+    """Find (source, module) pairs where a target's sources import a module its spec excludes.
+
+    PyInstaller would build such a target fine and it would only fail with
+    ModuleNotFoundError when that import runs.
+    """
+    excludes = set(TARGETS[name].get("excludes", []))
+    return [(path, module) for path in local_sources(TARGETS[name]["script"]) for module in imported_names(path) if module in excludes]
+
+def environment_fingerprint():
+    """Describe the interpreter and installed packages, which end up inside every executable."""
+    packages = sorted(f"{dist.metadata['Name']}=={dist.version}" for dist in importlib.metadata.distributions())
+    return [sys.version, platform.platform(), *packages]
+
+def target_fingerprint(name, environment):
+    """Hash everything a target's build depends on: spec, sources, data files and environment."""
+    target = TARGETS[name]
+    digest = hashlib.sha256()
+    for path in [target["spec"], *local_sources(target["script"]), *target["data"]]:
+        if not os.path.exists(path):
+            continue
+        digest.update(path.encode() + b"\0")
+        with open(path, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    for line in environment:
+        digest.update(line.encode() + b"\0")
+    return digest.hexdigest()
+
+def load_fingerprints():
+    try:
+        with open(FINGERPRINT_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_fingerprints(fingerprints):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(f"{FINGERPRINT_FILE}.tmp", "w") as f:
+        json.dump(fingerprints, f, indent=2)
+    os.replace(f"{FINGERPRINT_FILE}.tmp", FINGERPRINT_FILE)
+
+def exe_path(name):
+    if "exe" in TARGETS[name]:
+        return os.path.join(DIST_DIR, name, TARGETS[name]["exe"] + EXE_SUFFIX)
+    return os.path.join(DIST_DIR, name + EXE_SUFFIX)
+
+def build_target(name):
+    """Run PyInstaller for one target in its own process, logging to build/<name>.log. Returns (ok, seconds)."""
+    # Without --clean, PyInstaller reuses the analysis in build/<name> for whatever did not change
+    command = [sys.executable, "-m", "PyInstaller", "--noconfirm", f"--workpath={BUILD_DIR}", f"--distpath={DIST_DIR}", TARGETS[name]["spec"]]
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    start = time.perf_counter()
+    with open(os.path.join(BUILD_DIR, f"{name}.log"), "w") as log:
+        result = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode == 0, time.perf_counter() - start
+
+def smoke_test(name):
+    """Launch a built executable headless with ZOZFIL_SMOKE_TEST and check it ran through every screen."""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    # In a scratch directory, so the update cache and other files the game writes go nowhere
+    with tempfile.TemporaryDirectory() as scratch:
+        result_path = os.path.join(scratch, "smoke_test.txt")
+        env["ZOZFIL_SMOKE_TEST"] = result_path
+        with open(os.path.join(BUILD_DIR, f"{name}.smoke.log"), "w") as log:
+            try:
+                subprocess.run([os.path.abspath(exe_path(name))], cwd=scratch, env=env, stdout=log, stderr=subprocess.STDOUT, timeout=SMOKE_TEST_TIMEOUT)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                log.write(f"{e}\n")
+                return False
+        return os.path.exists(result_path)
+
+def build(names, force=False):
+    """Build the targets whose inputs changed since their last build, concurrently. Returns the failed targets."""
+    environment = environment_fingerprint()
+    fingerprints = load_fingerprints()
+    stale = {}
+    for name in names:
+        start = time.perf_counter()
+        fingerprint = target_fingerprint(name, environment)
+        if force or fingerprints.get(name) != fingerprint or not os.path.exists(exe_path(name)):
+            stale[name] = fingerprint
+        else:
+            print(f"{name}: up to date ({time.perf_counter() - start:.2f}s to check)")
+
+    failed = []
+    for name in list(stale):
+        conflicts = excluded_imports(name)
+        for path, module in conflicts:
+            print(f"{name}: {path} imports {module}, which {TARGETS[name]['spec']} excludes")
+        if conflicts:
+            del stale[name]
+            fingerprints.pop(name, None)
+            failed.append(name)
+    for name in stale:
+        print(f"Building {name}...")
+    with ThreadPoolExecutor(max_workers=max(1, len(stale))) as executor:
+        results = dict(zip(stale, executor.map(build_target, stale)))
+    for name, (ok, seconds) in results.items():
+        if ok and TARGETS[name].get("smoke_test") and not smoke_test(name):
+            fingerprints.pop(name, None)
+            failed.append(name)
+            print(f"{name}: built in {seconds:.1f}s but failed its smoke test, see {os.path.join(BUILD_DIR, f'{name}.smoke.log')}")
+        elif ok:
+            fingerprints[name] = stale[name]
+            print(f"{name}: built in {seconds:.1f}s")
+        else:
+            # A failed build must not look up to date next time
+            fingerprints.pop(name, None)
+            failed.append(name)
+            print(f"{name}: failed after {seconds:.1f}s, see {os.path.join(BUILD_DIR, f'{name}.log')}")
+    save_fingerprints(fingerprints)
+
+    # Copy the single-file executables next to the scripts for local testing, dist/ stays for push_update
+    for name in names:
+        if "exe" in TARGETS[name]:
+            continue
+        rebuilt = name in results and name not in failed
+        if os.path.exists(exe_path(name)) and (rebuilt or not os.path.exists(name + EXE_SUFFIX)):
+            shutil.copy2(exe_path(name), name + EXE_SUFFIX)
+    return failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Project Zozfil executables, skipping ones whose inputs did not change.")
+    parser.add_argument("targets", nargs="*", help=f"targets to build out of {', '.join(TARGETS)}, all by default")
+    parser.add_argument("--force", action="store_true", help="rebuild even when nothing changed")
+    args = parser.parse_args()
+    unknown = [name for name in args.targets if name not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target: {', '.join(unknown)}")
 
-# Build the game executable
-print("Building app.exe...")
-subprocess.run([
-    "pyinstaller",
-    "--onefile",
-    "--windowed",
-    "--name=app",
-    "main.py"
-], check=True)
-
-# Build the updater executable
-print("Building updater.exe...")
-subprocess.run([
-    "pyinstaller",
-    "--onefile",
-    "--name=updater",
-    "updater.py"
-], check=True)
-
-# Move executables to the project directory
-if os.path.exists("dist"):
-    for file in os.listdir("dist"):
-        if file.endswith(".exe"):
-            shutil.move(f"dist/{file}", ".")
-    shutil.rmtree("dist")
-
-if os.path.exists("build"):
-    shutil.rmtree("build")
-
-if os.path.exists("app.spec"):
-    os.remove("app.spec")
-
-if os.path.exists("updater.spec"):
-    os.remove("updater.spec")
-
-print("Executables built successfully!")
\ No newline at end of file
+    start = time.perf_counter()
+    failed = build(args.targets or list(TARGETS), args.force)
+    if failed:
+        print(f"Build failed: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"Executables built successfully in {time.perf_counter() - start:.1f}s!")
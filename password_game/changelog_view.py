@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Changelog View for Project Zozfil
+Scrollable changelog that loads on first use and only draws the entries on screen.
+"""
+
+import json
+from bisect import bisect_right
+from collections import OrderedDict
+
+import pygame
+
+# Configuration
+ENTRY_GAP = 20
+LINE_HEIGHT = 25
+ENTRY_CACHE_SIZE = 32  # Rendered entry boxes kept around
+
+class ChangelogView:
+    """Virtualized list of changelog entry boxes."""
+
+    def __init__(self, path, font_cache, text_layout, family, color):
+        self.path = path
+        self.font_cache = font_cache
+        self.text_layout = text_layout
+        self.family = family
+        self.color = color
+        self._entries = None
+        self.entry_lines = []
+        self.offsets = []
+        self.bottoms = []
+        self.surfaces = OrderedDict()
+        self.style = None
+
+    def load(self):
+        """Load the changelog data file if it hasn't been loaded yet."""
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, "r") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            self._entries = []
+
+    @property
+    def entries(self):
+        """Changelog entries, loaded from the data file on first access."""
+        self.load()
+        return self._entries
+
+    def layout(self, width, font_size):
+        """Wrap every entry's changes and work out where each box sits."""
+        if self.style == (width, font_size):
+            return
+        self.style = (width, font_size)
+        self.surfaces.clear()
+
+        font = self.font_cache.get(self.family, font_size)
+        self.entry_lines = []
+        self.offsets = []
+        self.bottoms = []
+        y = 0
+        for entry in self.entries:
+            changes = self.text_layout.wrap_many([f"- {change}" for change in entry["changes"]], font, width - 60)
+            lines = [line for change_lines in changes for line in change_lines]
+            self.entry_lines.append(lines)
+            self.offsets.append(y)
+            y += 60 + len(lines) * LINE_HEIGHT
+            self.bottoms.append(y)
+            y += ENTRY_GAP
+
+    def max_scroll(self, viewport, font_size):
+        """Get the furthest the list can scroll in viewport."""
+        self.layout(viewport.width, font_size)
+        content_height = self.bottoms[-1] if self.bottoms else 0
+        return max(0, content_height - viewport.height)
+
+    def render_entry(self, index, width, font_size):
+        """Render one entry box with its version and changes."""
+        font = self.font_cache.get(self.family, font_size)
+        lines = self.entry_lines[index]
+        surface = pygame.Surface((width, 60 + len(lines) * LINE_HEIGHT), pygame.SRCALPHA)
+        pygame.draw.rect(surface, self.color, surface.get_rect(), 2)
+
+        surface.blit(font.render(f"Version {self.entries[index]['version']}", True, self.color), (20, 10))
+        change_y = 40
+        for line in lines:
+            surface.blit(font.render(line, True, self.color), (40, change_y))
+            change_y += LINE_HEIGHT
+        return surface
+
+    def get_entry_surface(self, index, width, font_size):
+        """Get the rendered box for an entry, rendering it on first use."""
+        surface = self.surfaces.get(index)
+        if surface is not None:
+            self.surfaces.move_to_end(index)
+            return surface
+
+        surface = self.render_entry(index, width, font_size)
+        self.surfaces[index] = surface
+        if len(self.surfaces) > ENTRY_CACHE_SIZE:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def draw(self, target, viewport, scroll, font_size):
+        """Draw the entries that overlap viewport, scrolled down by scroll pixels."""
+        scroll = min(scroll, self.max_scroll(viewport, font_size))
+        previous_clip = target.get_clip()
+        target.set_clip(viewport.clip(previous_clip))
+
+        # Skip straight to the first entry that ends below the top of the viewport
+        index = bisect_right(self.bottoms, scroll)
+        while index < len(self.offsets) and self.offsets[index] < scroll + viewport.height:
+            surface = self.get_entry_surface(index, viewport.width, font_size)
+            target.blit(surface, (viewport.x, viewport.y + self.offsets[index] - scroll))
+            index += 1
+
+        target.set_clip(previous_clip)
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Checksums for Project Zozfil
+File hashing shared by the updater and the publishing tools, with no dependencies beyond the stdlib.
+"""
+
+import hashlib
+
+# Configuration
+HASH_BLOCK = 1024 * 1024  # Bytes read at a time
+
+def file_sha256(path):
+    """Hash a file in large blocks without reading it all into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compression for Project Zozfil
+Precompressed variants of update artifacts and streaming decoders for them.
+"""
+
+import gzip
+import lzma
+import zlib
+import shutil
+
+try:
+    import zstandard
+except ImportError:  # Optional, zstd variants are skipped without it
+    zstandard = None
+
+# Configuration
+GZIP_LEVEL = 9
+XZ_PRESET = 9
+ZSTD_LEVEL = 19
+COPY_BUFFER = 1024 * 1024
+
+# Content-codings with the suffix of their precompressed file
+SUFFIXES = {"zstd": ".zst", "xz": ".xz", "gzip": ".gz"}
+
+def available_encodings():
+    """List the content-codings this install can write and decode."""
+    return [encoding for encoding in SUFFIXES if encoding != "zstd" or zstandard]
+
+def accept_encoding():
+    """Get an Accept-Encoding header value offering every decodable coding."""
+    return ", ".join(available_encodings())
+
+def compress_file(path, encodings=None):
+    """Write a precompressed copy of path for each encoding and return their paths."""
+    written = []
+    for encoding in encodings or available_encodings():
+        variant_path = path + SUFFIXES[encoding]
+        with open(path, "rb") as source:
+            if encoding == "gzip":
+                target = gzip.open(variant_path, "wb", compresslevel=GZIP_LEVEL)
+            elif encoding == "xz":
+                target = lzma.open(variant_path, "wb", preset=XZ_PRESET)
+            else:
+                target = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(variant_path, "wb"), closefd=True)
+            with target:
+                shutil.copyfileobj(source, target, COPY_BUFFER)
+        written.append(variant_path)
+    return written
+
+def decompressor(encoding):
+    """Get an object whose decompress() decodes a stream in the given content-coding."""
+    if encoding == "gzip":
+        return zlib.decompressobj(wbits=31)
+    if encoding == "xz":
+        return lzma.LZMADecompressor()
+    if encoding == "zstd" and zstandard:
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Binary Deltas for Project Zozfil
+Patch format and the updater's side: applying patches and picking a chain of them.
+"""
+
+import heapq
+import hashlib
+import lzma
+import struct
+
+# Configuration
+COPY_BUFFER = 1024 * 1024  # Bytes moved at a time while applying a patch
+
+# Patch format: MAGIC, the target size, then a stream of copy/insert ops, all xz compressed
+MAGIC = b"ZOZDELTA1"
+SIZE = struct.Struct("<Q")
+COPY = struct.Struct("<QQ")  # Offset and length in the old file
+COPY_OP = b"C"
+INSERT_OP = b"I"  # Followed by a length and that many literal bytes
+
+class DeltaError(Exception):
+    """A patch is malformed or does not match the file it is applied to."""
+
+def read_exact(f, size):
+    data = f.read(size)
+    if len(data) != size:
+        raise DeltaError("Patch ended early")
+    return data
+
+def apply_patch(source_path, patch_path, output_path):
+    """Rebuild a file from source_path and a patch, streaming both. Returns the output's SHA-256."""
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(source_path, "rb") as source, lzma.open(patch_path, "rb") as patch, open(output_path, "wb", buffering=COPY_BUFFER) as output:
+            if read_exact(patch, len(MAGIC)) != MAGIC:
+                raise DeltaError(f"{patch_path} is not a patch")
+            (target_size,) = SIZE.unpack(read_exact(patch, SIZE.size))
+
+            while True:
+                op = patch.read(1)
+                if not op:
+                    break
+                if op == COPY_OP:
+                    offset, remaining = COPY.unpack(read_exact(patch, COPY.size))
+                    source.seek(offset)
+                    reader = source
+                elif op == INSERT_OP:
+                    (remaining,) = SIZE.unpack(read_exact(patch, SIZE.size))
+                    reader = patch
+                else:
+                    raise DeltaError(f"Unknown op {op!r} in {patch_path}")
+
+                while remaining:
+                    data = reader.read(min(remaining, COPY_BUFFER))
+                    if not data:
+                        raise DeltaError(f"Ran out of data applying {patch_path} to {source_path}")
+                    output.write(data)
+                    digest.update(data)
+                    remaining -= len(data)
+                    written += len(data)
+    except lzma.LZMAError as e:
+        raise DeltaError(f"{patch_path} is corrupt: {e}") from e
+
+    if written != target_size:
+        raise DeltaError(f"Patch produced {written} bytes, expected {target_size}")
+    return digest.hexdigest()
+
+def find_patch_chain(patches, from_version, to_version):
+    """Find the patches with the smallest total size leading from from_version to to_version.
+
+    patches are manifest entries with "from", "to" and "size". Returns the
+    list of entries in the order they apply, or None if no chain exists.
+    """
+    queue = [(0, 0, from_version, [])]
+    pushed = 0  # Tie breaker, so equal costs never compare the chains
+    done = set()
+    while queue:
+        cost, _, version, chain = heapq.heappop(queue)
+        if version == to_version:
+            return chain
+        if version in done:
+            continue
+        done.add(version)
+        for patch in patches:
+            if patch["from"] == version and patch["to"] not in done:
+                pushed += 1
+                heapq.heappush(queue, (cost + patch["size"], pushed, patch["to"], chain + [patch]))
+    return None
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Patch Builder for Project Zozfil
+Builds patches that turn one release's app.exe into the next, used only by push_update.py.
+"""
+
+import lzma
+
+import numpy as np
+
+from delta import MAGIC, SIZE, COPY, COPY_OP, INSERT_OP
+
+# Configuration
+BLOCK_SIZE = 1024  # Smallest run of bytes matched between the old and new file
+SCAN_CHUNK = 1 << 20  # Target positions hashed at once, bounds the memory used
+PATCH_PRESET = 9  # xz level for the patch stream
+
+def window_keys(data, start, stop, block_size):
+    """Hash the block_size window starting at every position in [start, stop).
+
+    The key packs the window's byte sum with its position-weighted sum, so
+    it can be computed for every position at once from two running sums.
+    """
+    values = data[start:stop + block_size - 1].astype(np.int64)
+    sums = np.concatenate(([0], np.cumsum(values)))
+    weighted = np.concatenate(([0], np.cumsum(values * np.arange(len(values), dtype=np.int64))))
+    starts = np.arange(stop - start, dtype=np.int64)
+    plain = sums[block_size:] - sums[:-block_size]
+    offset = weighted[block_size:] - weighted[:-block_size] - starts * plain
+    return (plain << 32) | offset
+
+def block_keys(data, block_size):
+    """Hash each whole, aligned block of data."""
+    count = len(data) // block_size
+    blocks = data[:count * block_size].reshape(count, block_size).astype(np.int64)
+    plain = blocks.sum(axis=1)
+    offset = (blocks * np.arange(block_size, dtype=np.int64)).sum(axis=1)
+    return (plain << 32) | offset
+
+def match_length(source, source_pos, target, target_pos, limit, step):
+    """Count how many bytes match going forward (step 1) or backward (step -1), up to limit."""
+    length = 0
+    # Whole blocks first, then halve down to single bytes
+    size = BLOCK_SIZE
+    while size:
+        while length + size <= limit:
+            if step > 0:
+                a = source[source_pos + length:source_pos + length + size]
+                b = target[target_pos + length:target_pos + length + size]
+            else:
+                a = source[source_pos - length - size:source_pos - length]
+                b = target[target_pos - length - size:target_pos - length]
+            if a != b:
+                break
+            length += size
+        size //= 2
+    return length
+
+def find_ops(source, target, block_size=BLOCK_SIZE):
+    """Yield ("copy", offset, length) and ("insert", start, end) ops that rebuild target from source."""
+    source_array = np.frombuffer(source, dtype=np.uint8)
+    target_array = np.frombuffer(target, dtype=np.uint8)
+    keys = block_keys(source_array, block_size)
+    offsets = {}
+    for index, key in enumerate(keys.tolist()):
+        offsets.setdefault(key, index * block_size)
+    known = np.unique(keys)
+
+    pos = 0  # Everything before pos is already covered by ops
+    last_window = len(target) - block_size + 1 if len(known) else 0
+    for chunk_start in range(0, max(0, last_window), SCAN_CHUNK):
+        chunk_stop = min(chunk_start + SCAN_CHUNK, last_window)
+        if chunk_stop <= pos:
+            continue
+        window = window_keys(target_array, chunk_start, chunk_stop, block_size)
+        found = known[np.minimum(np.searchsorted(known, window), len(known) - 1)] == window
+        for candidate in (np.flatnonzero(found) + chunk_start).tolist():
+            if candidate < pos:
+                continue
+            source_pos = offsets[int(window[candidate - chunk_start])]
+            if source[source_pos:source_pos + block_size] != target[candidate:candidate + block_size]:
+                continue  # Hash collision
+            back = match_length(source, source_pos, target, candidate, min(source_pos, candidate - pos), -1)
+            ahead = match_length(source, source_pos, target, candidate, min(len(source) - source_pos, len(target) - candidate), 1)
+            if candidate - back > pos:
+                yield ("insert", pos, candidate - back)
+            yield ("copy", source_pos - back, back + ahead)
+            pos = candidate + ahead
+    if pos < len(target):
+        yield ("insert", pos, len(target))
+
+def create_patch(source_path, target_path, patch_path):
+    """Write a patch that rebuilds target_path from source_path."""
+    with open(source_path, "rb") as f:
+        source = f.read()
+    with open(target_path, "rb") as f:
+        target = f.read()
+
+    with lzma.open(patch_path, "wb", preset=PATCH_PRESET) as patch:
+        patch.write(MAGIC + SIZE.pack(len(target)))
+        for op in find_ops(source, target):
+            if op[0] == "copy":
+                patch.write(COPY_OP + COPY.pack(op[1], op[2]))
+            else:
+                patch.write(INSERT_OP + SIZE.pack(op[2] - op[1]))
+                patch.write(target[op[1]:op[2]])
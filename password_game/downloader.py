@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Downloader for Project Zozfil
+Resumable downloads split into parallel byte-range segments.
+"""
+
+import os
+import json
+import time
+import lzma
+import zlib
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from urllib3.exceptions import HTTPError as TransportError
+
+from checksums import file_sha256
+from compression import accept_encoding, decompressor
+
+# Configuration
+SEGMENTS = 4  # Parallel connections for one download
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024  # Smaller files get fewer segments
+CHUNK_SIZE = 256 * 1024  # Bytes read from the socket at a time
+WRITE_BUFFER = 1024 * 1024  # Bytes collected before each write to disk
+STATE_INTERVAL = 0.5  # Seconds between saves of the resume state
+RETRIES = 3  # Attempts per segment after the first
+RETRY_DELAY = 1.0  # Seconds, multiplied by the attempt number
+
+class DownloadError(Exception):
+    """A download could not be completed or failed verification."""
+
+class Download:
+    """One file fetched from the update server into path.
+
+    Progress is kept in a sidecar state file next to path, so running the
+    same download again after a dropped connection only fetches the
+    missing bytes. When the server sends a precompressed variant, the
+    compressed bytes are what gets fetched and resumed, and they are
+    decoded into path at the end.
+    """
+
+    def __init__(self, client, name, path, sha256=None, segments=SEGMENTS):
+        self.client = client
+        self.name = name
+        self.path = path
+        self.state_path = f"{path}.state"
+        self.part_path = path  # Where the bytes as sent by the server go
+        self.encoding = None
+        self.headers = {"Accept-Encoding": accept_encoding()}
+        self.sha256 = sha256
+        self.segments = segments
+        self.lock = threading.Lock()
+        self.state = None
+        self.state_saved = 0.0
+        self.digest = None
+
+    def run(self):
+        """Fetch the file, verify it and return its path."""
+        response = self.client.session.head(self.client.url(self.name), headers=self.headers, timeout=self.client.timeout, allow_redirects=True)
+        response.raise_for_status()
+        size = int(response.headers.get("Content-Length", 0))
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        self.encoding = response.headers.get("Content-Encoding")
+        if self.encoding:
+            self.part_path = f"{self.path}.{self.encoding}"
+
+        if size and response.headers.get("Accept-Ranges") == "bytes":
+            self.state = self.load_state(size, validator) or self.start_state(size, validator)
+            self.fetch_segments()
+            self.check_size(size)
+            if self.encoding:
+                self.decode_part()
+        else:
+            # No ranges means no resuming either, so stream it in one go
+            self.fetch_whole()
+
+        self.verify()
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        return self.path
+
+    def load_state(self, size, validator):
+        """Get the saved progress of this download, if it is for the same file."""
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get("url"), state.get("size"), state.get("validator"), state.get("encoding")) != (self.client.url(self.name), size, validator, self.encoding):
+            return None
+        if not os.path.exists(self.part_path) or os.path.getsize(self.part_path) != size:
+            return None
+        return state
+
+    def start_state(self, size, validator):
+        """Preallocate the file and split it into segments."""
+        with open(self.part_path, "wb") as f:
+            f.truncate(size)
+
+        count = max(1, min(self.segments, size // MIN_SEGMENT_SIZE))
+        step = -(-size // count)
+        # Each segment is [start, end, next byte to fetch]
+        segments = [[start, min(start + step, size), start] for start in range(0, size, step)]
+        state = {"url": self.client.url(self.name), "size": size, "validator": validator, "encoding": self.encoding, "segments": segments}
+        self.write_state(state)
+        return state
+
+    def write_state(self, state):
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+        self.state_saved = time.monotonic()
+
+    def save_progress(self, force=False):
+        """Save the segment progress, at most every STATE_INTERVAL seconds unless forced."""
+        with self.lock:
+            if force or time.monotonic() - self.state_saved >= STATE_INTERVAL:
+                self.write_state(self.state)
+
+    def fetch_segments(self):
+        """Fetch the unfinished segments in parallel."""
+        pending = [segment for segment in self.state["segments"] if segment[2] < segment[1]]
+        if not pending:
+            return
+        try:
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                for future in [executor.submit(self.fetch_segment, segment) for segment in pending]:
+                    future.result()
+        finally:
+            self.save_progress(force=True)
+
+    def fetch_segment(self, segment):
+        """Fetch the rest of one segment, retrying dropped connections."""
+        headers = dict(self.headers)
+        if self.state["validator"]:
+            # Get the whole file back instead of mixing in bytes from a newer one
+            headers["If-Range"] = self.state["validator"]
+
+        for attempt in range(RETRIES + 1):
+            headers["Range"] = f"bytes={segment[2]}-{segment[1] - 1}"
+            try:
+                with self.client.get(self.name, headers=headers, stream=True) as response:
+                    if response.status_code != 206 or response.headers.get("Content-Encoding") != self.encoding:
+                        raise DownloadError(f"Server did not return the requested range of {self.name} (HTTP {response.status_code})")
+                    with open(self.part_path, "r+b") as f:
+                        f.seek(segment[2])
+                        buffer = bytearray()
+                        try:
+                            for chunk in response.raw.stream(CHUNK_SIZE, decode_content=False):
+                                buffer += chunk
+                                if len(buffer) >= WRITE_BUFFER:
+                                    self.write_segment(f, segment, buffer)
+                                    buffer.clear()
+                        finally:
+                            # Keep whatever arrived before a dropped connection
+                            self.write_segment(f, segment, buffer)
+            except (requests.RequestException, TransportError) as e:
+                # Raw streams raise urllib3's errors rather than requests' wrapped ones
+                if attempt == RETRIES:
+                    raise DownloadError(f"Could not download {self.name}: {e}") from e
+            if segment[2] >= segment[1]:
+                return
+            time.sleep(RETRY_DELAY * (attempt + 1))
+        raise DownloadError(f"Could not download {self.name}: connection kept closing early")
+
+    def write_segment(self, f, segment, buffer):
+        """Write buffered bytes for a segment and record how far it got."""
+        data = buffer[:segment[1] - segment[2]]
+        if not data:
+            return
+        f.write(data)
+        f.flush()
+        segment[2] += len(data)
+        self.save_progress()
+
+    def fetch_whole(self):
+        """Stream the file over one connection, decoding and hashing it on the way."""
+        with self.client.get(self.name, headers=self.headers, stream=True) as response:
+            response.raise_for_status()
+            encoding = response.headers.get("Content-Encoding")
+            self.decode(response.raw.stream(CHUNK_SIZE, decode_content=False), encoding)
+
+    def decode_part(self):
+        """Decode the downloaded compressed file into path."""
+        with open(self.part_path, "rb") as f:
+            self.decode(iter(lambda: f.read(CHUNK_SIZE), b""), self.encoding)
+        os.remove(self.part_path)
+
+    def decode(self, chunks, encoding):
+        """Write chunks to path, decompressing them if encoding is set, and hash the result."""
+        try:
+            decoder = decompressor(encoding) if encoding else None
+        except ValueError as e:
+            raise DownloadError(str(e)) from e
+        digest = hashlib.sha256()
+        try:
+            with open(self.path, "wb", buffering=WRITE_BUFFER) as f:
+                for chunk in chunks:
+                    if decoder:
+                        chunk = decoder.decompress(chunk)
+                    digest.update(chunk)
+                    f.write(chunk)
+                if decoder and hasattr(decoder, "flush"):
+                    tail = decoder.flush()
+                    digest.update(tail)
+                    f.write(tail)
+        except (zlib.error, lzma.LZMAError) as e:
+            self.discard()
+            raise DownloadError(f"{self.name} could not be decompressed: {e}") from e
+        self.digest = digest.hexdigest()
+
+    def check_size(self, size):
+        """Check the fetched file has the size the server announced."""
+        actual_size = os.path.getsize(self.part_path)
+        if actual_size != size:
+            self.discard()
+            raise DownloadError(f"{self.name} is {actual_size} bytes, expected {size}")
+
+    def verify(self):
+        """Check the downloaded file against the expected checksum."""
+        if not self.sha256:
+            return
+        digest = self.digest or file_sha256(self.path)
+        if digest != self.sha256:
+            self.discard()
+            raise DownloadError(f"{self.name} failed its SHA-256 check")
+
+    def discard(self):
+        """Delete the file and its progress so the next attempt starts over."""
+        for path in {self.path, self.part_path, self.state_path}:
+            if os.path.exists(path):
+                os.remove(path)
+
+def download(client, name, path, sha256=None, segments=SEGMENTS):
+    """Download name from the update server into path, resuming earlier progress."""
+    return Download(client, name, path, sha256, segments).run()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Font and Text Caches for Project Zozfil
+Keeps loaded fonts and rendered text around so screens don't rebuild them every frame.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+# Configuration
+FONT_CACHE_SIZE = 16
+TEXT_CACHE_BYTES = 8 * 1024 * 1024  # Memory cap for rendered text surfaces
+
+def surface_bytes(surface):
+    """Estimate the pixel memory held by a surface."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+class FontCache:
+    """Loaded fonts keyed by (family, size) with least-recently-used eviction."""
+
+    def __init__(self, max_entries=FONT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.fonts = OrderedDict()
+        self.scale_factor = None
+
+    def get(self, family, size):
+        """Return the font for family at size, loading it on first use."""
+        key = (family, size)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.fonts.move_to_end(key)
+            return font
+
+        font = pygame.font.SysFont(family, size)
+        self.fonts[key] = font
+        if len(self.fonts) > self.max_entries:
+            self.fonts.popitem(last=False)
+        return font
+
+    def rescale(self, scale_factor):
+        """Drop every cached font if the screen scale factor changed."""
+        if scale_factor == self.scale_factor:
+            return False
+        self.fonts.clear()
+        self.scale_factor = scale_factor
+        return True
+
+class TextCache:
+    """Rendered text surfaces keyed by (text, size, color, antialias) with a memory cap."""
+
+    def __init__(self, font_cache, family, max_bytes=TEXT_CACHE_BYTES):
+        self.font_cache = font_cache
+        self.family = family
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, antialias=True):
+        """Return a surface for text, rendering it only on a cache miss."""
+        key = (text, size, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font_cache.get(self.family, size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        self.used_bytes += surface_bytes(surface)
+
+        # Evict least recently used surfaces, always keeping the newest one
+        while self.used_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.used_bytes -= surface_bytes(evicted)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface."""
+        self.surfaces.clear()
+        self.used_bytes = 0
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Frame Scheduler for Project Zozfil
+Paces the main loop, dropping to a low frame rate when nobody is playing.
+"""
+
+import time
+
+import pygame
+
+# Configuration
+ACTIVE_FPS = 60
+IDLE_FPS = 10
+BACKGROUND_FPS = 2
+IDLE_TIMEOUT = 15.0  # Seconds without input before dropping to IDLE_FPS
+
+# Scheduler modes
+ACTIVE = "active"
+IDLE = "idle"
+BACKGROUND = "background"
+
+class FrameScheduler:
+    """Chooses a frame rate from recent input and window focus."""
+
+    def __init__(self, active_fps=ACTIVE_FPS, idle_fps=IDLE_FPS, background_fps=BACKGROUND_FPS, idle_timeout=IDLE_TIMEOUT):
+        self.rates = {ACTIVE: active_fps, IDLE: idle_fps, BACKGROUND: background_fps}
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+        self.mode = ACTIVE
+        self.focused = True
+        self.last_input = time.monotonic()
+        self.frame_start = time.monotonic()
+        self.pending = []
+
+    def poll_events(self):
+        """Get pending events and update the mode from them."""
+        events = self.pending + pygame.event.get()
+        self.pending = []
+        for event in events:
+            if event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            else:
+                if event.type == pygame.WINDOWFOCUSGAINED:
+                    self.focused = True
+                self.last_input = time.monotonic()
+
+        if not self.focused:
+            self.mode = BACKGROUND
+        elif time.monotonic() - self.last_input >= self.idle_timeout:
+            self.mode = IDLE
+        else:
+            self.mode = ACTIVE
+        return events
+
+    def tick(self):
+        """Wait out the rest of the frame at the current mode's rate."""
+        if self.mode == ACTIVE:
+            self.clock.tick(self.rates[ACTIVE])
+        else:
+            # Block on the event queue so any event ends the wait immediately
+            remaining = 1.0 / self.rates[self.mode] - (time.monotonic() - self.frame_start)
+            if remaining > 0:
+                event = pygame.event.wait(int(remaining * 1000))
+                if event.type != pygame.NOEVENT:
+                    self.pending.append(event)
+            self.clock.tick()
+        self.frame_start = time.monotonic()
+
+    def get_fps(self):
+        """Get the effective frame rate over the last few frames."""
+        return self.clock.get_fps()
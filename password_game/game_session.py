@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Game Session for Project Zozfil
+Password round state with hints worked out once per guess.
+"""
+
+import random
+import string
+
+# Configuration
+PASSWORD_COUNT = 5
+PASSWORD_LENGTH = 6
+MAX_GUESSES = 6
+CHARACTERS = string.ascii_letters + string.digits + string.punctuation
+
+# Password generation
+def generate_password(length=8):
+    """Generate a random password."""
+    return ''.join(random.choice(CHARACTERS) for _ in range(length))
+
+class PasswordProfile:
+    """A password with the features its hints reveal, worked out when it is generated."""
+
+    __slots__ = ("password", "length", "prefix", "suffix", "uppercase", "digits", "chars", "hints")
+
+    def __init__(self, password):
+        self.password = password
+        self.length = len(password)
+        self.prefix = password[:2]
+        self.suffix = password[-2:]
+        self.uppercase = sum(1 for c in password if c.isupper())
+        self.digits = sum(1 for c in password if c.isdigit())
+        self.chars = frozenset(password)
+        # General hints, revealed one more per wrong guess
+        self.hints = (
+            f"Length: {self.length}",
+            f"Starts with: {self.prefix}",
+            f"Uppercase letters: {self.uppercase}",
+            f"Digits: {self.digits}",
+            f"Ends with: {self.suffix}",
+        )
+
+    def wordle_hint(self, guess):
+        """Generate Wordle-like feedback for the guess."""
+        result = []
+        for i, c in enumerate(guess):
+            if i < self.length and c == self.password[i]:
+                result.append(f"[{c}]")  # Correct position
+            elif c in self.chars:
+                result.append(f"({c})")  # Correct char, wrong position
+            else:
+                result.append(c)  # Wrong
+        return ''.join(result)
+
+class GameSession:
+    """One run through the passwords."""
+
+    __slots__ = ("profiles", "index", "guess", "guesses_used", "max_guesses", "last_guess", "game_over", "hint")
+
+    def __init__(self, count=PASSWORD_COUNT, length=PASSWORD_LENGTH, max_guesses=MAX_GUESSES):
+        self.profiles = [PasswordProfile(generate_password(length)) for _ in range(count)]
+        self.max_guesses = max_guesses
+        self.reset()
+
+    @property
+    def solved(self):
+        return self.index >= len(self.profiles)
+
+    @property
+    def password_number(self):
+        """The 1-based number of the current password, staying on the last one once all are solved."""
+        return min(self.index + 1, len(self.profiles))
+
+    @property
+    def guesses_left(self):
+        return self.max_guesses - self.guesses_used
+
+    def reset(self):
+        """Go back to the first password, keeping the same passwords."""
+        self.index = 0
+        self.guess = ""
+        self.guesses_used = 0
+        self.last_guess = ""
+        self.game_over = False
+        self.update_hint()
+
+    def update_hint(self):
+        """Work out the hint text for the current password and last guess."""
+        if self.solved:
+            self.hint = ""
+            return
+        profile = self.profiles[self.index]
+        hints = list(profile.hints[:self.guesses_used + 1])
+        if self.last_guess:
+            hints.append(f"Last guess: {profile.wordle_hint(self.last_guess)}")
+        self.hint = ", ".join(hints)
+
+    def type(self, text):
+        """Add typed text to the guess."""
+        self.guess += text
+
+    def backspace(self):
+        """Remove the last character of the guess."""
+        self.guess = self.guess[:-1]
+
+    def submit(self):
+        """Check the guess against the current password."""
+        if self.solved:
+            return
+        if self.guess == self.profiles[self.index].password:
+            self.index += 1
+            self.guesses_used = 0
+            self.last_guess = ""
+        else:
+            self.last_guess = self.guess
+            self.guesses_used += 1
+            if self.guesses_used >= self.max_guesses:
+                self.game_over = True
+        self.guess = ""
+        self.update_hint()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Import Audit for Project Zozfil
+Finds the modules PyInstaller bundles into app.exe that the game never imports.
+"""
+
+import os
+import ast
+import sys
+import json
+import argparse
+import tempfile
+import importlib.util
+
+# Configuration
+BUNDLE_TOC = os.path.join("build", "app", "Analysis-00.toc")  # Written by the last full app build
+EXCLUDES_FILE = "bundle_excludes.json"  # Read by app_onedir.spec
+AUDIT_IDLE_FRAMES = 5  # Frames spent on each screen of the benchmark script
+KEEP = ["main"]  # Never excluded, whatever the audit finds
+OPTIONAL_IMPORT_ERRORS = {"ImportError", "ModuleNotFoundError", "Exception", "BaseException"}
+# Functions that only point packagers or debug output at optional modules, the game never calls them
+UNCALLED_FUNCTIONS = {("pygame", "packager_imports"), ("numpy.__config__", "_check_pyyaml")}
+
+def bundled_modules(toc_path):
+    """Get the Python version a build was made with and the modules it bundled, pure and extension."""
+    with open(toc_path, "r") as f:
+        toc = ast.literal_eval(f.read())
+    python_version = next(item for item in toc if isinstance(item, str))
+    modules = set()
+    for entries in toc:
+        if not isinstance(entries, list):
+            continue
+        for entry in entries:
+            if not (isinstance(entry, tuple) and len(entry) == 3):
+                continue
+            name, _, kind = entry
+            if kind == "PYMODULE":
+                modules.add(name)
+            elif kind == "EXTENSION":
+                # numpy\_core\_multiarray_umath.cp311-win_amd64.pyd is numpy._core._multiarray_umath
+                modules.add(name.replace("\\", "/").split(".")[0].replace("/", "."))
+    return python_version, modules
+
+def runtime_modules():
+    """Play the benchmark script, the update check and the profiler overlay, and list every module imported."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+
+    # In a scratch directory, so the update cache and other files the game writes go nowhere
+    with tempfile.TemporaryDirectory() as scratch:
+        previous_dir = os.getcwd()
+        os.chdir(scratch)
+        try:
+            # main first, so it can block imports before pygame pulls them in
+            import main as game
+            import pygame
+            from benchmark import build_script
+
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=game.PROFILER_KEY, unicode="", mod=0, scancode=0))
+            for events in build_script(game, AUDIT_IDLE_FRAMES):
+                for event in events:
+                    pygame.event.post(event)
+                game.run_frame(pygame.event.get())
+            game.check_for_updates()
+            game.profiler.close()
+            pygame.quit()
+        finally:
+            os.chdir(previous_dir)
+    # None entries are imports the game blocks on purpose
+    return {name for name, module in sys.modules.items() if module is not None}
+
+def optional_imports(name, tree):
+    """Find the nodes inside try blocks that recover from a failed import, or in functions never called."""
+    optional = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and (name, node.name) in UNCALLED_FUNCTIONS:
+            optional.update(id(child) for child in ast.walk(node))
+        if not isinstance(node, ast.Try):
+            continue
+        for handler in node.handlers:
+            types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+            if any(t is None or getattr(t, "id", None) in OPTIONAL_IMPORT_ERRORS for t in types):
+                optional.update(id(child) for statement in node.body for child in ast.walk(statement))
+                break
+    return optional
+
+def referenced_modules(module_names):
+    """Find every module a required import statement of the given modules' sources names.
+
+    Catches imports the audit run did not reach: platform branches, error
+    handling and functions that import lazily. Imports guarded by an
+    except ImportError are left out, the code already copes without them.
+    """
+    referenced = set()
+    for name in module_names:
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None)
+        if not path or not path.endswith(".py"):
+            continue
+        try:
+            with open(path, "rb") as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError, ValueError):
+            continue
+        package = name if path.endswith("__init__.py") else name.rpartition(".")[0]
+        optional = optional_imports(name, tree)
+        for node in ast.walk(tree):
+            if id(node) in optional:
+                continue
+            if isinstance(node, ast.Import):
+                referenced.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    try:
+                        base = importlib.util.resolve_name("." * node.level + base, package)
+                    except (ImportError, ValueError):
+                        continue
+                referenced.add(base)
+                referenced.update(f"{base}.{alias.name}" for alias in node.names)
+    return referenced
+
+def top_level(names):
+    return {name.split(".")[0] for name in names if name}
+
+def audit(toc_path):
+    """Compare the bundle against the modules the game needs and pick the top-level packages to exclude."""
+    bundle_python, bundled = bundled_modules(toc_path)
+    imported = runtime_modules()
+    needed = top_level(imported) | top_level(referenced_modules(imported)) | set(KEEP)
+    excludes = sorted(top_level(bundled) - needed)
+    return {
+        "python": sys.version,
+        "bundle_python": bundle_python,
+        "bundled_modules": len(bundled),
+        "imported_modules": len(imported),
+        "excluded_modules": len([name for name in bundled if name.split(".")[0] in excludes]),
+        "excludes": excludes,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit which bundled modules Project Zozfil never imports and write the onedir build's exclusions.")
+    parser.add_argument("--toc", default=BUNDLE_TOC, help="PyInstaller Analysis TOC of a full app build")
+    parser.add_argument("--output", default=EXCLUDES_FILE, help="where to write the exclusion list")
+    args = parser.parse_args()
+
+    result = audit(args.toc)
+    if result["bundle_python"] != result["python"]:
+        # Platform-specific imports differ, a list made anywhere but on the build machine's interpreter can drop modules the build needs
+        print(f"The bundle was built with Python {result['bundle_python']} but this audit ran on {result['python']}, "
+              f"run it with the interpreter that builds the app; {args.output} was not written", file=sys.stderr)
+        sys.exit(1)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+        f.write("\n")
+    print(f"{result['excluded_modules']} of {result['bundled_modules']} bundled modules are never imported, "
+          f"excluding {len(result['excludes'])} top-level packages: {', '.join(result['excludes'])}")
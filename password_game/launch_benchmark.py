@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Launch Benchmark for Project Zozfil
+Measures cold and warm launch-to-first-frame time for each distribution profile.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from percentiles import percentile
+
+# Configuration
+EXE_SUFFIX = ".exe" if os.name == "nt" else ""
+PROFILES = {
+    "onefile": os.path.join("dist", "app" + EXE_SUFFIX),
+    "onedir": os.path.join("dist", "app_onedir"),
+    "source": "main.py",
+}
+DEFAULT_WARM_RUNS = 5
+LAUNCH_TIMEOUT = 60  # Seconds before a launch that never draws a frame counts as failed
+
+def distribution_size(path):
+    """Get the bytes and file count of a profile's files."""
+    if os.path.isfile(path):
+        return os.path.getsize(path), 1
+    sizes = [os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names]
+    return sum(sizes), len(sizes)
+
+def install(profile, path, directory):
+    """Copy a profile into directory, as a fresh install or update leaves it, and get the command to launch it."""
+    if profile == "source":
+        return [sys.executable, os.path.abspath(path)]
+    target = os.path.join(directory, os.path.basename(path))
+    if os.path.isdir(path):
+        shutil.copytree(path, target)
+        return [os.path.join(target, "app" + EXE_SUFFIX)]
+    shutil.copy2(path, target)
+    return [target]
+
+def drop_file_cache():
+    """Evict file contents from the OS cache where that is allowed, so the next launch reads from disk."""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except (AttributeError, OSError):
+        return False
+
+def launch(command, directory, env):
+    """Start the game once and get the seconds until its first frame was presented."""
+    probe = os.path.join(directory, "first_frame.txt")
+    env = dict(env, ZOZFIL_LAUNCH_PROBE=probe)
+    start = time.time()
+    subprocess.run(command, cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=LAUNCH_TIMEOUT)
+    try:
+        with open(probe, "r") as f:
+            first_frame = float(f.read())
+    except (OSError, ValueError):
+        raise RuntimeError(f"{command[-1]} exited without drawing a frame")
+    os.remove(probe)
+    return first_frame - start
+
+def measure(profile, path, warm_runs, env):
+    """Launch a fresh copy of a profile once cold, then warm_runs more times."""
+    with tempfile.TemporaryDirectory() as directory:
+        command = install(profile, path, directory)
+        cache_dropped = drop_file_cache()
+        cold = launch(command, directory, env)
+        warm = [launch(command, directory, env) for _ in range(warm_runs)]
+    size, files = distribution_size(path)
+    return {
+        "size_bytes": size,
+        "files": files,
+        "cold_ms": round(cold * 1000, 1),
+        "cold_cache_dropped": cache_dropped,
+        "warm_p50_ms": round(percentile(sorted(warm), 0.50) * 1000, 1) if warm else None,
+        "warm_min_ms": round(min(warm) * 1000, 1) if warm else None,
+        "warm_max_ms": round(max(warm) * 1000, 1) if warm else None,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure how long each Project Zozfil distribution takes from launch to its first frame.")
+    parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), help="profiles to measure, all that are built by default")
+    parser.add_argument("--warm-runs", type=int, default=DEFAULT_WARM_RUNS, help="launches after the cold one")
+    parser.add_argument("--headless", action="store_true", help="use SDL's dummy video driver instead of opening a window")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.headless:
+        env["SDL_VIDEODRIVER"] = "dummy"
+    profiles = args.profiles or [profile for profile, path in PROFILES.items() if os.path.exists(path)]
+
+    results = {}
+    for profile in profiles:
+        print(f"Launching {profile}...", file=sys.stderr)
+        results[profile] = measure(profile, PROFILES[profile], args.warm_runs, env)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Update Load Test for Project Zozfil
+Runs many updater clients against a local update server and reports how it held up.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark import get_peak_rss_kb
+from percentiles import percentile
+
+# Configuration
+DEFAULT_CLIENTS = [10, 50, 100]
+DEFAULT_SIZE_MB = 20
+DEFAULT_ROUNDS = 1  # Times each client runs the check-and-download flow
+CURRENT_VERSION = "1.0.0"
+LATEST_VERSION = "1.0.1"
+
+def make_artifacts(directory, size, encodings):
+    """Write a synthetic release, partly compressible like a real bundle."""
+    from compression import compress_file
+
+    block = os.urandom(64 * 1024)
+    exe_path = os.path.join(directory, f"{LATEST_VERSION}.exe")
+    digest = hashlib.sha256()
+    with open(exe_path, "wb") as f:
+        written = 0
+        while written < size:
+            # Alternate random and repetitive data
+            chunk = (block if written // len(block) % 2 else bytes(len(block)))[:size - written]
+            f.write(chunk)
+            digest.update(chunk)
+            written += len(chunk)
+    if encodings:
+        compress_file(exe_path, encodings)
+
+    with open(os.path.join(directory, "latest_version.json"), "w") as f:
+        json.dump({"version": LATEST_VERSION, "size": size, "sha256": digest.hexdigest()}, f)
+
+def run_server(directory, max_connections, ready, commands):
+    """Serve directory on a loopback port and report this process's resource use on request."""
+    from update_http import UpdateServer
+
+    server = UpdateServer(("127.0.0.1", 0), directory, max_connections, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ready.send(server.server_address[1])
+    while commands.recv() == "stats":
+        commands.send({"cpu_seconds": time.process_time(), "peak_rss_kb": get_peak_rss_kb()})
+    server.shutdown()
+
+def run_client(base_url, workdir, rounds, barrier, results):
+    """Run the updater's check-and-download flow, recording each request."""
+    from update_client import UpdateClient
+    from downloader import download
+
+    requests_made = []
+
+    def record(response, *args, **kwargs):
+        body = int(response.headers.get("Content-Length", 0)) if response.request.method == "GET" else 0
+        requests_made.append((response.elapsed.total_seconds(), body))
+
+    client = UpdateClient(base_url, cache_file=os.path.join(workdir, "cache.json"), cache_ttl=0)
+    client.session.hooks["response"].append(record)
+    flows = []
+    errors = []
+    barrier.wait()
+    for _ in range(rounds):
+        start = time.perf_counter()
+        try:
+            latest_version = client.check_for_updates(CURRENT_VERSION)
+            download(client, f"{latest_version}.exe", os.path.join(workdir, "temp_app.exe"), client.manifest.get("sha256"))
+            flows.append(time.perf_counter() - start)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+    client.close()
+    results.append({"requests": requests_made, "flows": flows, "errors": errors})
+
+def run_client_group(base_url, count, rounds):
+    """Run count clients on threads in this process.
+
+    Returns their results with the wall-clock times the group started and
+    finished, so process start-up is not counted against the server.
+    """
+    results = []
+    times = {}
+    barrier = threading.Barrier(count, action=lambda: times.setdefault("started", time.time()))
+    with tempfile.TemporaryDirectory() as root:
+        threads = []
+        for i in range(count):
+            workdir = os.path.join(root, str(i))
+            os.makedirs(workdir)
+            thread = threading.Thread(target=run_client, args=(base_url, workdir, rounds, barrier, results))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+    return times["started"], time.time(), results
+
+def summarize(samples):
+    """Get latency percentiles in milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return {
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+def run_level(base_url, clients, rounds, processes, commands):
+    """Run one concurrency level and measure the server while it lasts."""
+    groups = [clients // processes + (1 if i < clients % processes else 0) for i in range(processes)]
+    groups = [count for count in groups if count]
+
+    commands.send("stats")
+    server_before = commands.recv()
+    with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+        outcomes = list(executor.map(run_client_group, [base_url] * len(groups), groups, [rounds] * len(groups)))
+    commands.send("stats")
+    server_after = commands.recv()
+
+    elapsed = max(finished for _, finished, _ in outcomes) - min(started for started, _, _ in outcomes)
+    results = [result for _, _, group in outcomes for result in group]
+
+    latencies = [latency for result in results for latency, _ in result["requests"]]
+    flows = [flow for result in results for flow in result["flows"]]
+    errors = [error for result in results for error in result["errors"]]
+    body_bytes = sum(size for result in results for _, size in result["requests"])
+    # Measured across the whole level, so it slightly understates the load
+    server_cpu = server_after["cpu_seconds"] - server_before["cpu_seconds"]
+    return {
+        "clients": clients,
+        "seconds": round(elapsed, 3),
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "throughput_mb_per_second": round(body_bytes / elapsed / (1024 * 1024), 1),
+        "response_latency": summarize(latencies),
+        "update_latency": summarize(flows),
+        "completed_updates": len(flows),
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+        "server_cpu_percent": round(server_cpu / elapsed * 100, 1),
+        "server_peak_rss_kb": server_after["peak_rss_kb"],
+    }
+
+def run_load_test(levels, size, encodings, rounds, processes, max_connections):
+    """Start a server with a synthetic release and run each concurrency level against it."""
+    with tempfile.TemporaryDirectory() as directory:
+        make_artifacts(directory, size, encodings)
+        ready, ready_child = multiprocessing.Pipe()
+        commands, commands_child = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=run_server, args=(directory, max_connections, ready_child, commands_child), daemon=True)
+        server.start()
+        try:
+            base_url = f"http://127.0.0.1:{ready.recv()}/"
+            results = [run_level(base_url, clients, rounds, processes, commands) for clients in levels]
+        finally:
+            commands.send("stop")
+            server.join(10)
+    return {"artifact_bytes": size, "encodings": encodings, "rounds": rounds, "levels": results}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Project Zozfil update server with simulated updater clients.")
+    parser.add_argument("--clients", type=int, nargs="+", default=DEFAULT_CLIENTS, help="concurrency levels to run")
+    parser.add_argument("--size-mb", type=float, default=DEFAULT_SIZE_MB, help="size of the synthetic app.exe")
+    parser.add_argument("--encodings", nargs="*", default=[], choices=("gzip", "xz", "zstd"), help="precompressed variants to publish")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="updates each client runs")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="client processes to spread the clients over")
+    parser.add_argument("--max-connections", type=int, help="override the server's connection limit")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    from update_http import MAX_CONNECTIONS
+
+    results = run_load_test(args.clients, int(args.size_mb * 1024 * 1024), args.encodings, args.rounds,
+                            args.processes, args.max_connections or MAX_CONNECTIONS)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    print(report)
+    if any(level["errors"] for level in results["levels"]):
+        sys.exit(1)
@@ -4,71 +4,132 @@ Password Guessing Game
 A sleek game where users guess a series of randomized passwords.
 """
 
-import pygame
 import sys
-import random
-import string
-import json
 import os
-import ctypes
-import requests
+import threading
+import time
+
+from startup_trace import mark  # Before pygame, so the trace covers its import
 
-# Initialize Pygame
-pygame.init()
+# pygame.pkgdata uses pkg_resources only when it imports, and importing it costs more than the rest of pygame
+sys.modules.setdefault("pkg_resources", None)
+import pygame
+mark("import pygame")
+
+from fonts import FontCache, TextCache
+from version_provider import VersionProvider
+from ui import Button, Layout, LayoutCache
+from rendering import DirtyRenderer, MAX_DIRTY_SPRITES
+from particles import ParticleSystem
+from frame_scheduler import FrameScheduler
+from text_layout import TextLayout
+from game_session import GameSession
+from profiler import FrameProfiler, OVERLAY_FONT, OVERLAY_FONT_SIZE
+mark("import game modules")
+
+# Initialize only the parts of Pygame the game uses, opening the audio device would only slow startup
+pygame.display.init()
+pygame.font.init()
+mark("pygame init")
 
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 BACKGROUND_COLOR = (0, 0, 0)  # Black
 WHITE = (255, 255, 255)
+FONT_FAMILY = "Arial"
 FONT_SIZE = 32
 UPDATE_URL = "http://localhost:8000/"
+VERSION_FILE = "version.json"
+UPDATE_TIMEOUT = (3, 5)  # Seconds to connect and to wait for the response
+# Bundled data files live next to main.py, or in the unpack dir when frozen
+RESOURCE_DIR = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+CHANGELOG_FILE = os.path.join(RESOURCE_DIR, "changelog.json")
+RENDER_MODE = os.environ.get("ZOZFIL_RENDER_MODE", "flip")  # "flip", "dirty" or "texture"; flip stays the default until dirty beats it in benchmark.py
+RENDER_DRIVER = os.environ.get("ZOZFIL_RENDER_DRIVER")  # SDL render driver for texture mode, e.g. "software", best available by default
+PARTICLE_COUNTS = (100, 1000, 10000)  # Choices offered in the settings screen
+PARTICLE_COUNT = int(os.environ.get("ZOZFIL_PARTICLES", PARTICLE_COUNTS[0]))
+ACTIVE_FPS = 60
+IDLE_FPS = 10  # After IDLE_TIMEOUT seconds without input
+BACKGROUND_FPS = 2  # While the window is unfocused
+IDLE_TIMEOUT = 15
+SHOW_FPS = os.environ.get("ZOZFIL_SHOW_FPS") == "1"
+PROFILE = os.environ.get("ZOZFIL_PROFILE") == "1"
+PROFILE_CSV = os.environ.get("ZOZFIL_PROFILE_CSV")  # Stream profiler samples to this file
+LAUNCH_PROBE = os.environ.get("ZOZFIL_LAUNCH_PROBE")  # File that gets the time of the first frame, then the game quits
+SMOKE_TEST = os.environ.get("ZOZFIL_SMOKE_TEST")  # File that gets "ok" once every screen and lazy import has run, then the game quits
+PROFILER_KEY = pygame.K_F3
+PROFILER_PHASES = ("events", "handlers", "draw", "dots", "overlay", "present", "frame")
+
+def create_screen():
+    """Open the window, drawn through SDL's Renderer in texture mode and as the display surface otherwise."""
+    global RENDER_MODE
+    if RENDER_MODE == "texture":
+        try:
+            from texture_rendering import TextureScreen
+            return TextureScreen("Project Zozfil", (SCREEN_WIDTH, SCREEN_HEIGHT), RENDER_DRIVER)
+        except (ImportError, ValueError, pygame.error) as e:
+            print(f"Texture rendering unavailable, falling back to software blits: {e}")
+            RENDER_MODE = "flip"
+    surface = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("Project Zozfil")
+    return surface
+
+def set_screen_mode():
+    """Apply the current window size and fullscreen setting."""
+    global screen
+    if RENDER_MODE == "texture":
+        screen.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), fullscreen)
+    else:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE | (pygame.FULLSCREEN if fullscreen else 0))
+
+def set_caption(title):
+    if RENDER_MODE == "texture":
+        screen.set_caption(title)
+    else:
+        pygame.display.set_caption(title)
 
 # Set up the screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
-pygame.display.set_caption("Project Zozfil")
+screen = create_screen()
+mark("window")
 
 # Font
-font = pygame.font.SysFont("Arial", FONT_SIZE)
+font_cache = FontCache()
+text_cache = TextCache(font_cache, FONT_FAMILY)
+text_layout = TextLayout()
 
-def scale_font(size):
-    """Scale font size based on screen resolution."""
+def get_scale_factor():
+    """Get the UI scale factor for the current screen resolution."""
     base_width = 800
     base_height = 600
-    scale_factor = min(SCREEN_WIDTH / base_width, SCREEN_HEIGHT / base_height)
-    scaled_size = max(12, int(size * scale_factor))  # Ensure minimum readable size
-    return pygame.font.SysFont("Arial", scaled_size)
+    return min(SCREEN_WIDTH / base_width, SCREEN_HEIGHT / base_height)
+
+def scale_size(size):
+    """Scale a font size based on screen resolution."""
+    return max(12, int(size * get_scale_factor()))  # Ensure minimum readable size
+
+def scale_font(size):
+    """Scale font size based on screen resolution."""
+    return font_cache.get(FONT_FAMILY, scale_size(size))
+
+def render_text(text, size=FONT_SIZE, color=WHITE, scale=True):
+    """Render text through the shared text cache."""
+    if scale:
+        size = scale_size(size)
+    return text_cache.render(text, size, color)
+
+font_cache.rescale(get_scale_factor())
+mark("fonts")
+
+version_provider = VersionProvider(VERSION_FILE)
+update_client = None  # Created by the update check, so requests is never imported before the first frame
 
 def get_version():
     """Get the current version from version.json."""
-    version = "1.0.0"
-    try:
-        with open("version.json", "r") as f:
-            version_data = json.load(f)
-            version = version_data.get("version", version)
-    except FileNotFoundError:
-        pass
-    return version
-
-def wrap_text(text, font, max_width):
-    """Wrap text to fit within max_width."""
-    words = text.split(' ')
-    lines = []
-    current_line = ""
-    
-    for word in words:
-        test_line = current_line + word + " "
-        if font.size(test_line)[0] <= max_width:
-            current_line = test_line
-        else:
-            if current_line:
-                lines.append(current_line.strip())
-            current_line = word + " "
-    
-    if current_line:
-        lines.append(current_line.strip())
-    
-    return lines
+    return version_provider.get()
+
+# Posted by the background update check when it finishes
+UPDATE_CHECK_DONE = pygame.event.custom_type()
 
 # Game states
 MENU = 0
@@ -80,524 +141,519 @@ CHANGELOGS = 5
 
 current_state = MENU
 
-# Password generation
-def generate_password(length=8):
-    """Generate a random password."""
-    characters = string.ascii_letters + string.digits + string.punctuation
-    return ''.join(random.choice(characters) for _ in range(length))
-
 # Game variables
-passwords = [generate_password(6) for _ in range(5)]
-current_password_index = 0
-user_guess = ""
-max_guesses = 6
-guesses_used = 0
-game_over = False
+session = GameSession()
 update_available = False
-last_guess = ""
-
-# Changelog data
-changelog_data = [
-    {
-        "version": "1.0.5",
-        "changes": [
-            "Made window resizable by dragging edges",
-            "Removed resolution settings, kept fullscreen toggle",
-            "Added progressive general hints that reveal more with wrong guesses",
-            "Improved hint system with both general clues and Wordle-like feedback"
-        ]
-    },
-    {
-        "version": "1.0.4",
-        "changes": [
-            "Fixed back button navigation from settings during gameplay",
-            "Fixed game over enter key handling to prevent negative guesses",
-            "Improved last guess display formatting",
-            "Made resolution and fullscreen settings functional",
-            "Added Changelogs menu with scrollable history",
-            "Enhanced UI with better button boxes and theming"
-        ]
-    },
-    {
-        "version": "1.0.3",
-        "changes": [
-            "Fixed update download corruption with streaming",
-            "Improved hint system with Wordle-like feedback",
-            "Balanced difficulty: 6-char passwords, 6 guesses",
-            "Always show password length hint"
-        ]
-    },
-    {
-        "version": "1.0.2",
-        "changes": [
-            "Added progressive hints on incorrect guesses",
-            "Fixed update notification bug",
-            "Version displayed on all screens",
-            "ESC key opens pause menu globally"
-        ]
-    },
-    {
-        "version": "1.0.1",
-        "changes": [
-            "Initial release",
-            "Password guessing game with animated background",
-            "Settings menu with graphics options",
-            "Automatic update system"
-        ]
-    }
-]
+
+# Guess line surface, rendered again only when the guess or the font size changes
+guess_surface = None
+guess_key = None
+
+# Changelog view and data, loaded the first time the changelogs screen is opened
+changelog_view = None
 
 scroll_y = 0
 prev_state = MENU
-current_resolution = (SCREEN_WIDTH, SCREEN_HEIGHT)
 fullscreen = False
-available_resolutions = pygame.display.list_modes()
-if current_resolution in available_resolutions:
-    res_index = available_resolutions.index(current_resolution)
-else:
-    res_index = 0
-    current_resolution = available_resolutions[0] if available_resolutions else (800, 600)
 
-# Animated dots
-class Dot:
-    def __init__(self):
-        self.x = random.randint(0, SCREEN_WIDTH)
-        self.y = random.randint(0, SCREEN_HEIGHT)
-        self.size = random.randint(2, 5)
-        self.speed_x = random.uniform(-1, 1)
-        self.speed_y = random.uniform(-1, 1)
+# UI layouts
+layouts = LayoutCache()
+
+def build_menu_layout():
+    """Lay out the main menu buttons."""
+    center_x = SCREEN_WIDTH // 2
+    return Layout([
+        Button("play", render_text("Play"), center_x, 245, WHITE),
+        Button("settings", render_text("Settings"), center_x, 295, WHITE),
+        Button("changelogs", render_text("Changelogs"), center_x, 345, WHITE),
+        Button("exit", render_text("Exit"), center_x, 395, WHITE),
+    ])
+
+def build_pause_layout():
+    """Lay out the pause menu buttons."""
+    center_x = SCREEN_WIDTH // 2
+    return Layout([
+        Button("resume", render_text("Resume", scale=False), center_x, 245, WHITE),
+        Button("settings", render_text("Settings", scale=False), center_x, 295, WHITE),
+        Button("main_menu", render_text("Main Menu", scale=False), center_x, 345, WHITE),
+        Button("exit", render_text("Exit", scale=False), center_x, 395, WHITE),
+    ])
+
+def build_settings_layout():
+    """Lay out the settings buttons."""
+    center_x = SCREEN_WIDTH // 2
+    return Layout([
+        Button("toggle_fullscreen", render_text("Toggle", 20), center_x, 195, WHITE),
+        Button("cycle_particles", render_text("Change", 20), center_x, 305, WHITE),
+        Button("back", render_text("Back"), center_x, 495, WHITE),
+    ])
+
+def build_changelogs_layout():
+    """Lay out the changelogs buttons."""
+    return Layout([Button("back", render_text("Back"), SCREEN_WIDTH // 2, 500, WHITE)])
+
+def build_game_over_layout():
+    """Lay out the game over buttons."""
+    return Layout([Button("back", render_text("Back to Menu"), SCREEN_WIDTH // 2, 545, WHITE)])
+
+LAYOUT_BUILDERS = {
+    "menu": build_menu_layout,
+    "pause": build_pause_layout,
+    "settings": build_settings_layout,
+    "changelogs": build_changelogs_layout,
+    "game_over": build_game_over_layout,
+}
+
+def get_layout(name):
+    """Get the cached layout for a screen."""
+    return layouts.get(name, LAYOUT_BUILDERS[name])
 
-dots = [Dot() for _ in range(100)]
+# Animated dots
+particles = ParticleSystem(PARTICLE_COUNT, SCREEN_WIDTH, SCREEN_HEIGHT, WHITE)
+mark("particles")
 
-def draw_dots():
+def draw_dots(target):
     """Draw animated dots on the screen."""
-    for dot in dots:
-        pygame.draw.circle(screen, WHITE, (int(dot.x), int(dot.y)), dot.size)
-        dot.x += dot.speed_x
-        dot.y += dot.speed_y
-        
-        # Bounce off edges
-        if dot.x <= 0 or dot.x >= SCREEN_WIDTH:
-            dot.speed_x *= -1
-        if dot.y <= 0 or dot.y >= SCREEN_HEIGHT:
-            dot.speed_y *= -1
-
-def draw_menu():
+    with profiler.section("dots"):
+        particles.draw(target)
+
+def get_dot_rects():
+    """Get the screen areas the dots are drawn over, or None if there are too many to track."""
+    if particles.count > MAX_DIRTY_SPRITES:
+        return None
+    return particles.rects()
+
+def draw_menu(target):
     """Draw the main menu."""
-    screen.fill(BACKGROUND_COLOR)
-    draw_dots()
-    
-    scaled_font = scale_font(FONT_SIZE)
-    title_text = scaled_font.render("Project Zozfil", True, WHITE)
-    play_text = scaled_font.render("Play", True, WHITE)
-    settings_text = scaled_font.render("Settings", True, WHITE)
-    changelogs_text = scaled_font.render("Changelogs", True, WHITE)
-    exit_text = scaled_font.render("Exit", True, WHITE)
-    
+    title_text = render_text("Project Zozfil")
     version = get_version()
-    version_text = scale_font(16).render(f"Version: {version}", True, WHITE)
+    version_text = render_text(f"Version: {version}", 16)
     
-    # Draw button boxes with size based on text
-    button_padding = 20
-    button_height = play_text.get_height() + 10
-
-    play_rect = pygame.Rect(SCREEN_WIDTH // 2 - (play_text.get_width() + button_padding) // 2, 245, play_text.get_width() + button_padding, button_height)
-    settings_rect = pygame.Rect(SCREEN_WIDTH // 2 - (settings_text.get_width() + button_padding) // 2, 295, settings_text.get_width() + button_padding, button_height)
-    changelogs_rect = pygame.Rect(SCREEN_WIDTH // 2 - (changelogs_text.get_width() + button_padding) // 2, 345, changelogs_text.get_width() + button_padding, button_height)
-    exit_rect = pygame.Rect(SCREEN_WIDTH // 2 - (exit_text.get_width() + button_padding) // 2, 395, exit_text.get_width() + button_padding, button_height)
-
-    pygame.draw.rect(screen, WHITE, play_rect, 2)
-    pygame.draw.rect(screen, WHITE, settings_rect, 2)
-    pygame.draw.rect(screen, WHITE, changelogs_rect, 2)
-    pygame.draw.rect(screen, WHITE, exit_rect, 2)
-
-    screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 100))
-    screen.blit(play_text, (play_rect.centerx - play_text.get_width() // 2, play_rect.centery - play_text.get_height() // 2))
-    screen.blit(settings_text, (settings_rect.centerx - settings_text.get_width() // 2, settings_rect.centery - settings_text.get_height() // 2))
-    screen.blit(changelogs_text, (changelogs_rect.centerx - changelogs_text.get_width() // 2, changelogs_rect.centery - changelogs_text.get_height() // 2))
-    screen.blit(exit_text, (exit_rect.centerx - exit_text.get_width() // 2, exit_rect.centery - exit_text.get_height() // 2))
-    screen.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
+    get_layout("menu").draw(target)
+
+    target.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 100))
+    target.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
     
     if update_available:
-        update_text = scaled_font.render("Update Available! Run updater.exe to update.", True, WHITE)
-        screen.blit(update_text, (SCREEN_WIDTH // 2 - update_text.get_width() // 2, 450))
+        update_text = render_text("Update Available! Run updater.exe to update.")
+        target.blit(update_text, (SCREEN_WIDTH // 2 - update_text.get_width() // 2, 450))
 
-def draw_pause_menu():
-    """Draw the pause menu."""
+def draw_pause_overlay(target):
+    """Dim everything drawn underneath the pause menu."""
     overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 128))
-    screen.blit(overlay, (0, 0))
-
-    resume_text = font.render("Resume", True, WHITE)
-    settings_text = font.render("Settings", True, WHITE)
-    main_menu_text = font.render("Main Menu", True, WHITE)
-    exit_text = font.render("Exit", True, WHITE)
+    target.blit(overlay, (0, 0))
 
-    button_padding = 20
-    button_height = resume_text.get_height() + 10
-
-    resume_rect = pygame.Rect(SCREEN_WIDTH // 2 - (resume_text.get_width() + button_padding) // 2, 245, resume_text.get_width() + button_padding, button_height)
-    settings_rect = pygame.Rect(SCREEN_WIDTH // 2 - (settings_text.get_width() + button_padding) // 2, 295, settings_text.get_width() + button_padding, button_height)
-    main_menu_rect = pygame.Rect(SCREEN_WIDTH // 2 - (main_menu_text.get_width() + button_padding) // 2, 345, main_menu_text.get_width() + button_padding, button_height)
-    exit_rect = pygame.Rect(SCREEN_WIDTH // 2 - (exit_text.get_width() + button_padding) // 2, 395, exit_text.get_width() + button_padding, button_height)
-
-    pygame.draw.rect(screen, WHITE, resume_rect, 2)
-    pygame.draw.rect(screen, WHITE, settings_rect, 2)
-    pygame.draw.rect(screen, WHITE, main_menu_rect, 2)
-    pygame.draw.rect(screen, WHITE, exit_rect, 2)
-
-    screen.blit(resume_text, (resume_rect.centerx - resume_text.get_width() // 2, resume_rect.centery - resume_text.get_height() // 2))
-    screen.blit(settings_text, (settings_rect.centerx - settings_text.get_width() // 2, settings_rect.centery - settings_text.get_height() // 2))
-    screen.blit(main_menu_text, (main_menu_rect.centerx - main_menu_text.get_width() // 2, main_menu_rect.centery - main_menu_text.get_height() // 2))
-    screen.blit(exit_text, (exit_rect.centerx - exit_text.get_width() // 2, exit_rect.centery - exit_text.get_height() // 2))
+def draw_pause_menu(target):
+    """Draw the pause menu."""
+    get_layout("pause").draw(target)
 
     # Display version
     version = get_version()
-    version_text = scale_font(16).render(f"Version: {version}", True, WHITE)
-    screen.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
+    version_text = render_text(f"Version: {version}", 16)
+    target.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
 
-def draw_changelogs():
+def draw_changelogs(target):
     """Draw the changelogs screen."""
-    screen.fill(BACKGROUND_COLOR)
-    draw_dots()
-
-    scaled_font = scale_font(FONT_SIZE)
-    small_font = scale_font(20)
-
-    title_text = scaled_font.render("Changelogs", True, WHITE)
-    back_text = scaled_font.render("Back", True, WHITE)
-
-    # Draw back button box
-    back_rect = pygame.Rect(SCREEN_WIDTH // 2 - (back_text.get_width() + 20) // 2, 500, back_text.get_width() + 20, back_text.get_height() + 10)
-    pygame.draw.rect(screen, WHITE, back_rect, 2)
-
-    screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 50))
-    screen.blit(back_text, (back_rect.centerx - back_text.get_width() // 2, back_rect.centery - back_text.get_height() // 2))
+    title_text = render_text("Changelogs")
 
-    y_offset = 120 - scroll_y
-    for entry in changelog_data:
-        # Draw box for each changelog
-        box_height = 60 + len(entry["changes"]) * 25
-        pygame.draw.rect(screen, WHITE, (50, y_offset, SCREEN_WIDTH - 100, box_height), 2)
+    get_layout("changelogs").draw(target)
+    target.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 50))
 
-        version_text = small_font.render(f"Version {entry['version']}", True, WHITE)
-        screen.blit(version_text, (70, y_offset + 10))
+    get_changelog_view().draw(target, get_changelog_viewport(), scroll_y, scale_size(20))
 
-        change_y = y_offset + 40
-        for change in entry["changes"]:
-            change_text = small_font.render(f"- {change}", True, WHITE)
-            screen.blit(change_text, (90, change_y))
-            change_y += 25
+def get_changelog_view():
+    """Get the changelog view, creating it on first use."""
+    global changelog_view
+    if changelog_view is None:
+        from changelog_view import ChangelogView
+        changelog_view = ChangelogView(CHANGELOG_FILE, font_cache, text_layout, FONT_FAMILY, WHITE)
+    return changelog_view
 
-        y_offset += box_height + 20
+def get_changelog_viewport():
+    """Get the area the changelog list scrolls in, between the title and the back button."""
+    return pygame.Rect(50, 120, SCREEN_WIDTH - 100, 370)
 
-def draw_settings():
+def draw_settings(target):
     """Draw the settings screen."""
-    screen.fill(BACKGROUND_COLOR)
-    draw_dots()
-
-    scaled_font = scale_font(FONT_SIZE)
-    small_font = scale_font(20)
-
     # Tab at the top
-    graphics_tab = small_font.render("Graphics", True, WHITE)
-    screen.blit(graphics_tab, (SCREEN_WIDTH // 2 - graphics_tab.get_width() // 2, 50))
+    graphics_tab = render_text("Graphics", 20)
+    target.blit(graphics_tab, (SCREEN_WIDTH // 2 - graphics_tab.get_width() // 2, 50))
 
     # Settings content
-    fullscreen_text = small_font.render(f"Fullscreen: {'On' if fullscreen else 'Off'}", True, WHITE)
-    back_text = scaled_font.render("Back", True, WHITE)
+    fullscreen_text = render_text(f"Fullscreen: {'On' if fullscreen else 'Off'}", 20)
+    target.blit(fullscreen_text, (SCREEN_WIDTH // 2 - fullscreen_text.get_width() // 2, 150))
+    particles_text = render_text(f"Particles: {particles.count}", 20)
+    target.blit(particles_text, (SCREEN_WIDTH // 2 - particles_text.get_width() // 2, 260))
 
     # Buttons
-    toggle_fs = small_font.render("Toggle", True, WHITE)
-
-    # Draw boxes
-    toggle_rect = pygame.Rect(SCREEN_WIDTH // 2 - (toggle_fs.get_width() + 20) // 2, 195, toggle_fs.get_width() + 20, toggle_fs.get_height() + 10)
-    back_rect = pygame.Rect(SCREEN_WIDTH // 2 - (back_text.get_width() + 20) // 2, 495, back_text.get_width() + 20, back_text.get_height() + 10)
-
-    pygame.draw.rect(screen, WHITE, toggle_rect, 2)
-    pygame.draw.rect(screen, WHITE, back_rect, 2)
-
-    screen.blit(fullscreen_text, (SCREEN_WIDTH // 2 - fullscreen_text.get_width() // 2, 150))
-    screen.blit(toggle_fs, (toggle_rect.centerx - toggle_fs.get_width() // 2, toggle_rect.centery - toggle_fs.get_height() // 2))
-    screen.blit(back_text, (back_rect.centerx - back_text.get_width() // 2, back_rect.centery - back_text.get_height() // 2))
+    get_layout("settings").draw(target)
 
     # Display version
     version = get_version()
-    version_text = scale_font(16).render(f"Version: {version}", True, WHITE)
-    screen.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
-
-def get_wordle_hint(guess, password):
-    """Generate Wordle-like feedback for the guess."""
-    if not guess:
-        return ""
-    result = []
-    for i, c in enumerate(guess):
-        if i < len(password) and c == password[i]:
-            result.append(f"[{c}]")  # Correct position
-        elif c in password:
-            result.append(f"({c})")  # Correct char, wrong position
-        else:
-            result.append(c)  # Wrong
-    return ''.join(result)
-
-def get_hint(password, wrong_guesses, last_guess):
-    """Generate progressive hints and Wordle feedback."""
-    hints = [
-        lambda p: f"Length: {len(p)}",
-        lambda p: f"Starts with: {p[:2]}",
-        lambda p: f"Uppercase letters: {sum(1 for c in p if c.isupper())}",
-        lambda p: f"Digits: {sum(1 for c in p if c.isdigit())}",
-        lambda p: f"Ends with: {p[-2:]}",
-    ]
-
-    available_hints = [hint(password) for hint in hints[:wrong_guesses + 1]]
-    if last_guess:
-        available_hints.append(f"Last guess: {get_wordle_hint(last_guess, password)}")
-    return ", ".join(available_hints)
-
-def draw_game():
+    version_text = render_text(f"Version: {version}", 16)
+    target.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
+
+def draw_game(target):
     """Draw the game screen."""
-    screen.fill(BACKGROUND_COLOR)
-    draw_dots()
-    
-    scaled_font = scale_font(FONT_SIZE)
     small_font = scale_font(20)
     
-    password_text = scaled_font.render(f"Password {current_password_index + 1}/5", True, WHITE)
-    guess_text = scaled_font.render(f"Guess: {user_guess}", True, WHITE)
-    guesses_text = scaled_font.render(f"Guesses left: {max_guesses - guesses_used}", True, WHITE)
+    password_text = render_text(f"Password {session.password_number}/{len(session.profiles)}")
+    guesses_text = render_text(f"Guesses left: {session.guesses_left}")
     
     # Wrap hint text
-    hint_full = f"Hint: {get_hint(passwords[current_password_index], guesses_used, last_guess)}"
-    hint_lines = wrap_text(hint_full, small_font, SCREEN_WIDTH - 100)
+    hint_full = f"Hint: {session.hint}"
+    hint_lines = text_layout.wrap(hint_full, small_font, SCREEN_WIDTH - 100)
     
-    screen.blit(password_text, (SCREEN_WIDTH // 2 - password_text.get_width() // 2, 100))
-    screen.blit(guess_text, (SCREEN_WIDTH // 2 - guess_text.get_width() // 2, 200))
-    screen.blit(guesses_text, (SCREEN_WIDTH // 2 - guesses_text.get_width() // 2, 400))
+    target.blit(password_text, (SCREEN_WIDTH // 2 - password_text.get_width() // 2, 100))
+    target.blit(guesses_text, (SCREEN_WIDTH // 2 - guesses_text.get_width() // 2, 400))
 
     # Draw wrapped hint text
     y_offset = 300
     for line in hint_lines:
-        hint_line_text = small_font.render(line, True, WHITE)
-        screen.blit(hint_line_text, (SCREEN_WIDTH // 2 - hint_line_text.get_width() // 2, y_offset))
+        hint_line_text = render_text(line, 20)
+        target.blit(hint_line_text, (SCREEN_WIDTH // 2 - hint_line_text.get_width() // 2, y_offset))
         y_offset += 30
 
-    if game_over:
-        game_over_text = scaled_font.render("Game Over! Press Enter to continue.", True, WHITE)
-        back_text = scaled_font.render("Back to Menu", True, WHITE)
-        back_rect = pygame.Rect(SCREEN_WIDTH // 2 - (back_text.get_width() + 20) // 2, 545, back_text.get_width() + 20, back_text.get_height() + 10)
-        pygame.draw.rect(screen, WHITE, back_rect, 2)
-        screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, 500))
-        screen.blit(back_text, (back_rect.centerx - back_text.get_width() // 2, back_rect.centery - back_text.get_height() // 2))
+    if session.game_over:
+        game_over_text = render_text("Game Over! Press Enter to continue.")
+        target.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, 500))
+        get_layout("game_over").draw(target)
 
     # Display version
     version = get_version()
-    version_text = scale_font(16).render(f"Version: {version}", True, WHITE)
-    screen.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
+    version_text = render_text(f"Version: {version}", 16)
+    target.blit(version_text, (SCREEN_WIDTH - version_text.get_width() - 10, SCREEN_HEIGHT - 30))
+
+def draw_guess(target):
+    """Draw the guess line, which changes with every keystroke."""
+    global guess_surface, guess_key
+    # Kept across frames so texture mode uploads it once per keystroke, and
+    # rendered directly so per-keystroke strings don't churn the text cache
+    key = (session.guess, scale_size(FONT_SIZE))
+    if key != guess_key:
+        guess_surface = scale_font(FONT_SIZE).render(f"Guess: {session.guess}", True, WHITE)
+        guess_key = key
+    return [target.blit(guess_surface, (SCREEN_WIDTH // 2 - guess_surface.get_width() // 2, 200))]
+
+def draw_profiler_overlay(target):
+    """Draw the frame profiler's percentiles and cache counters."""
+    with profiler.section("overlay"):
+        counters = {
+            "text cache": f"{text_cache.hits} hits, {text_cache.misses} misses, {text_cache.used_bytes // 1024} KB",
+            "fonts": f"{len(font_cache.fonts)}/{font_cache.max_entries} loaded",
+            "layers": f"{len(dirty_renderer.layers)} cached" if RENDER_MODE == "dirty" else "off",
+        }
+        if RENDER_MODE == "texture":
+            counters["textures"] = f"{len(screen.textures)} uploaded"
+        return profiler.draw_overlay(target, font_cache.get(OVERLAY_FONT, OVERLAY_FONT_SIZE), counters)
+
+def draw_dynamic(target):
+    """Draw what changes every frame over the static layers."""
+    rects = draw_guess(target) if current_state == PLAYING else []
+    if profiler.enabled:
+        rects.append(draw_profiler_overlay(target))
+    return rects
+
+def capture_pause_snapshot():
+    """Render the game frame once and pre-blend it with the pause overlay."""
+    snapshot = pygame.Surface(screen.get_size())
+    snapshot.fill(BACKGROUND_COLOR)
+    draw_dots(snapshot)
+    draw_game(snapshot)
+    draw_guess(snapshot)
+    draw_pause_overlay(snapshot)
+    return snapshot
+
+def draw_pause_snapshot(target):
+    """Draw the frozen, dimmed game frame behind the pause menu."""
+    global pause_snapshot
+    if pause_snapshot is None or pause_snapshot.get_size() != target.get_size():
+        pause_snapshot = capture_pause_snapshot()
+    target.blit(pause_snapshot, (0, 0))
+
+# Per-phase frame timings, toggled with F3
+profiler = FrameProfiler(PROFILER_PHASES)
+profiler.enabled = PROFILE
+
+# Frozen game frame shown while paused, captured again on each pause or resize
+pause_snapshot = None
+
+# Static painters per state, each drawn over the dots in its own layer
+SCREEN_PAINTERS = {
+    MENU: [draw_menu],
+    PLAYING: [draw_game],
+    PAUSED: [draw_pause_snapshot, draw_pause_menu],
+    SETTINGS: [draw_settings],
+    CHANGELOGS: [draw_changelogs],
+}
+
+dirty_renderer = DirtyRenderer(BACKGROUND_COLOR)
+
+def get_static_key():
+    """Get everything the static layers of the current screen depend on."""
+    return (current_state, get_version(), update_available, fullscreen, particles.count, scroll_y,
+            session.index, session.guesses_used, session.last_guess, session.game_over)
+
+def render_frame():
+    """Draw the current screen with the configured render mode."""
+    painters = SCREEN_PAINTERS[current_state]
+    # The dots are frozen into the pause snapshot
+    animated = current_state != PAUSED
+
+    with profiler.section("draw"):
+        if RENDER_MODE == "dirty":
+            sprite_rects = get_dot_rects() if animated else []
+            draw_sprites = draw_dots if animated else None
+            update_rects = dirty_renderer.render(screen, get_static_key(), painters, sprite_rects, draw_sprites, draw_dynamic)
+        else:
+            screen.fill(BACKGROUND_COLOR)
+            if animated:
+                draw_dots(screen)
+            for paint in painters:
+                paint(screen)
+            draw_dynamic(screen)
+            update_rects = None
+
+    with profiler.section("present"):
+        if RENDER_MODE == "texture":
+            screen.present()
+        elif update_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(update_rects)
 
 def handle_menu_click(pos):
     """Handle menu button clicks."""
     global current_state, prev_state
 
-    scaled_font = scale_font(FONT_SIZE)
-    play_text = scaled_font.render("Play", True, WHITE)
-    settings_text = scaled_font.render("Settings", True, WHITE)
-    changelogs_text = scaled_font.render("Changelogs", True, WHITE)
-    exit_text = scaled_font.render("Exit", True, WHITE)
-
-    button_padding = 20
-    button_height = play_text.get_height() + 10
-
-    play_rect = pygame.Rect(SCREEN_WIDTH // 2 - (play_text.get_width() + button_padding) // 2, 245, play_text.get_width() + button_padding, button_height)
-    settings_rect = pygame.Rect(SCREEN_WIDTH // 2 - (settings_text.get_width() + button_padding) // 2, 295, settings_text.get_width() + button_padding, button_height)
-    changelogs_rect = pygame.Rect(SCREEN_WIDTH // 2 - (changelogs_text.get_width() + button_padding) // 2, 345, changelogs_text.get_width() + button_padding, button_height)
-    exit_rect = pygame.Rect(SCREEN_WIDTH // 2 - (exit_text.get_width() + button_padding) // 2, 395, exit_text.get_width() + button_padding, button_height)
-
-    if play_rect.collidepoint(pos):
+    action = get_layout("menu").hit_test(pos)
+    if action == "play":
         current_state = PLAYING
-    elif settings_rect.collidepoint(pos):
+    elif action == "settings":
         prev_state = current_state
         current_state = SETTINGS
-    elif changelogs_rect.collidepoint(pos):
+    elif action == "changelogs":
         prev_state = current_state
         current_state = CHANGELOGS
-    elif exit_rect.collidepoint(pos):
+    elif action == "exit":
         current_state = EXIT
 
 def handle_changelogs_click(pos):
     """Handle changelogs button clicks."""
     global current_state, prev_state
 
-    scaled_font = scale_font(FONT_SIZE)
-    back_text = scaled_font.render("Back", True, WHITE)
-
-    back_rect = pygame.Rect(SCREEN_WIDTH // 2 - (back_text.get_width() + 20) // 2, 500, back_text.get_width() + 20, back_text.get_height() + 10)
-
-    if back_rect.collidepoint(pos):
+    if get_layout("changelogs").hit_test(pos) == "back":
         current_state = prev_state
 
 def handle_settings_click(pos):
     """Handle settings button clicks."""
     global current_state, prev_state, fullscreen
 
-    small_font = scale_font(20)
-    scaled_font = scale_font(FONT_SIZE)
-    toggle_fs = small_font.render("Toggle", True, WHITE)
-    back_text = scaled_font.render("Back", True, WHITE)
-
-    toggle_rect = pygame.Rect(SCREEN_WIDTH // 2 - (toggle_fs.get_width() + 20) // 2, 195, toggle_fs.get_width() + 20, toggle_fs.get_height() + 10)
-    back_rect = pygame.Rect(SCREEN_WIDTH // 2 - (back_text.get_width() + 20) // 2, 495, back_text.get_width() + 20, back_text.get_height() + 10)
-
-    if toggle_rect.collidepoint(pos):
+    action = get_layout("settings").hit_test(pos)
+    if action == "toggle_fullscreen":
         fullscreen = not fullscreen
-        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE | (pygame.FULLSCREEN if fullscreen else 0))
-    elif back_rect.collidepoint(pos):
+        set_screen_mode()
+    elif action == "cycle_particles":
+        next_index = (PARTICLE_COUNTS.index(particles.count) + 1) % len(PARTICLE_COUNTS) if particles.count in PARTICLE_COUNTS else 0
+        particles.set_count(PARTICLE_COUNTS[next_index])
+    elif action == "back":
         current_state = prev_state
 
 def handle_pause_menu_click(pos):
     """Handle pause menu button clicks."""
     global current_state, prev_state
 
-    resume_text = font.render("Resume", True, WHITE)
-    settings_text = font.render("Settings", True, WHITE)
-    main_menu_text = font.render("Main Menu", True, WHITE)
-    exit_text = font.render("Exit", True, WHITE)
-
-    button_padding = 20
-    button_height = resume_text.get_height() + 10
-
-    resume_rect = pygame.Rect(SCREEN_WIDTH // 2 - (resume_text.get_width() + button_padding) // 2, 245, resume_text.get_width() + button_padding, button_height)
-    settings_rect = pygame.Rect(SCREEN_WIDTH // 2 - (settings_text.get_width() + button_padding) // 2, 295, settings_text.get_width() + button_padding, button_height)
-    main_menu_rect = pygame.Rect(SCREEN_WIDTH // 2 - (main_menu_text.get_width() + button_padding) // 2, 345, main_menu_text.get_width() + button_padding, button_height)
-    exit_rect = pygame.Rect(SCREEN_WIDTH // 2 - (exit_text.get_width() + button_padding) // 2, 395, exit_text.get_width() + button_padding, button_height)
-
-    if resume_rect.collidepoint(pos):
+    action = get_layout("pause").hit_test(pos)
+    if action == "resume":
         current_state = PLAYING
-    elif settings_rect.collidepoint(pos):
+    elif action == "settings":
         prev_state = current_state
         current_state = SETTINGS
-    elif main_menu_rect.collidepoint(pos):
+    elif action == "main_menu":
         current_state = MENU
-    elif exit_rect.collidepoint(pos):
+    elif action == "exit":
         current_state = EXIT
 
 def handle_game_input(event):
     """Handle game input."""
-    global user_guess, current_password_index, guesses_used, game_over, last_guess
-
     if event.type == pygame.KEYDOWN:
-        if game_over:
+        if session.game_over:
             if event.key == pygame.K_RETURN:
-                current_password_index = 0
-                guesses_used = 0
-                game_over = False
-                last_guess = ""
-                user_guess = ""
+                session.reset()
             return
         if event.key == pygame.K_RETURN:
-            if user_guess == passwords[current_password_index]:
-                current_password_index += 1
-                guesses_used = 0
-                last_guess = ""
-                if current_password_index >= len(passwords):
-                    # Game won
-                    pass
-                user_guess = ""
-            else:
-                last_guess = user_guess
-                guesses_used += 1
-                if guesses_used >= max_guesses:
-                    game_over = True
-                user_guess = ""
+            session.submit()
         elif event.key == pygame.K_BACKSPACE:
-            user_guess = user_guess[:-1]
+            session.backspace()
         else:
-            user_guess += event.unicode
+            session.type(event.unicode)
+
+def get_update_client():
+    """Get the update client, importing the network stack on first use."""
+    global update_client
+    if update_client is None:
+        from update_client import UpdateClient
+        update_client = UpdateClient(UPDATE_URL, timeout=UPDATE_TIMEOUT)
+    return update_client
 
 # Check for updates
 def check_for_updates():
     """Check if an update is available."""
     try:
-        with open("version.json", "r") as f:
-            version_data = json.load(f)
-            current_version = version_data.get("version", "1.0.0")
-
-        response = requests.get(f"{UPDATE_URL}latest_version.json")
-        latest_version_data = response.json()
-        latest_version = latest_version_data.get("version", current_version)
-
-        if latest_version > current_version:
-            return True
-        else:
-            return False
+        return get_update_client().check_for_updates(get_version()) is not None
     except Exception as e:
         print(f"Error checking for updates: {e}")
         return False
 
-# Main game loop
-clock = pygame.time.Clock()
-running = True
+def run_update_check():
+    """Check for updates and tell the main loop the result."""
+    available = check_for_updates()
+    mark("update check")
+    pygame.event.post(pygame.event.Event(UPDATE_CHECK_DONE, available=available))
 
-# Check for updates at startup
-update_available = check_for_updates()
-
-# Show Windows notification if update is available
-if update_available:
-    ctypes.windll.user32.MessageBoxW(0, "An update is available for Project Zozfil. Run updater.exe to update.", "Update Available", 0x40 | 0x0)
-
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.VIDEORESIZE:
-            SCREEN_WIDTH, SCREEN_HEIGHT = event.size
-            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE | (pygame.FULLSCREEN if fullscreen else 0))
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if current_state == MENU:
-                handle_menu_click(event.pos)
-            elif current_state == PAUSED:
-                handle_pause_menu_click(event.pos)
-            elif current_state == SETTINGS:
-                handle_settings_click(event.pos)
-            elif current_state == CHANGELOGS:
-                handle_changelogs_click(event.pos)
-            elif current_state == PLAYING and game_over:
-                scaled_font = scale_font(FONT_SIZE)
-                back_text = scaled_font.render("Back to Menu", True, WHITE)
-                back_rect = pygame.Rect(SCREEN_WIDTH // 2 - (back_text.get_width() + 20) // 2, 545, back_text.get_width() + 20, back_text.get_height() + 10)
-                if back_rect.collidepoint(event.pos):
-                    current_password_index = 0
-                    guesses_used = 0
-                    game_over = False
-                    last_guess = ""
-                    user_guess = ""
-                    current_state = MENU
-        elif event.type == pygame.MOUSEWHEEL:
-            if current_state == CHANGELOGS:
-                scroll_y -= event.y * 20  # Scroll up/down
-                scroll_y = max(0, min(scroll_y, 500))  # Limit scroll
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE and current_state in (PLAYING, PAUSED):
-                current_state = PAUSED if current_state == PLAYING else PLAYING
-            elif current_state == PLAYING:
-                handle_game_input(event)
-    
-    if current_state == MENU:
-        draw_menu()
-    elif current_state == PLAYING:
-        draw_game()
-    elif current_state == PAUSED:
-        draw_game()
-        draw_pause_menu()
-    elif current_state == SETTINGS:
-        draw_settings()
-    elif current_state == CHANGELOGS:
-        draw_changelogs()
-    elif current_state == EXIT:
+    # Show Windows notification if update is available, on this thread so the game keeps running
+    if available and sys.platform == "win32":
+        import ctypes
+        ctypes.windll.user32.MessageBoxW(0, "An update is available for Project Zozfil. Run updater.exe to update.", "Update Available", 0x40 | 0x0)
+
+def start_update_check():
+    """Check for updates in the background so startup never waits on the network."""
+    threading.Thread(target=run_update_check, name="update-check", daemon=True).start()
+
+def write_launch_probe():
+    """Record when the first frame was presented, for launch_benchmark.py."""
+    with open(LAUNCH_PROBE, "w") as f:
+        f.write(repr(time.time()))
+
+def run_smoke_test():
+    """Draw every screen and load everything loaded lazily, so a trimmed build missing a module fails here."""
+    global current_state
+
+    from texture_rendering import TextureScreen  # Imported only in texture mode
+    try:
+        get_update_client().check_for_updates(get_version())
+    except OSError:
+        pass  # No update server needed, only the imports on the way to one
+    profiler.toggle()
+    for state in (CHANGELOGS, SETTINGS, PLAYING, PAUSED, MENU):
+        current_state = state
+        profiler.begin_frame()
+        run_frame([])
+        profiler.end_frame()
+    with open(SMOKE_TEST, "w") as f:
+        f.write("ok\n")
+
+def show_fps():
+    """Show the effective frame rate and scheduler mode in the window title."""
+    set_caption(f"Project Zozfil - {scheduler.get_fps():.0f} FPS ({scheduler.mode})")
+
+def resize_screen(size):
+    """Lay the game out again for a new window size."""
+    global SCREEN_WIDTH, SCREEN_HEIGHT
+
+    SCREEN_WIDTH, SCREEN_HEIGHT = size
+    set_screen_mode()
+    font_cache.rescale(get_scale_factor())
+    layouts.invalidate()
+    particles.resize(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+def handle_event(event):
+    """Handle one event from the queue."""
+    global running, current_state, scroll_y, pause_snapshot, update_available
+
+    if event.type == pygame.QUIT:
         running = False
+    elif event.type == UPDATE_CHECK_DONE:
+        update_available = event.available
+    elif event.type == pygame.VIDEORESIZE:
+        resize_screen(event.size)
+    elif event.type == pygame.WINDOWSIZECHANGED and RENDER_MODE == "texture":
+        # The texture window is not pygame's display window, so count on this event rather than VIDEORESIZE
+        if (event.x, event.y) != (SCREEN_WIDTH, SCREEN_HEIGHT):
+            resize_screen((event.x, event.y))
+    elif event.type == pygame.WINDOWEXPOSED:
+        dirty_renderer.invalidate()
+    elif event.type == pygame.MOUSEBUTTONDOWN:
+        if current_state == MENU:
+            handle_menu_click(event.pos)
+        elif current_state == PAUSED:
+            handle_pause_menu_click(event.pos)
+        elif current_state == SETTINGS:
+            handle_settings_click(event.pos)
+        elif current_state == CHANGELOGS:
+            handle_changelogs_click(event.pos)
+        elif current_state == PLAYING and session.game_over:
+            if get_layout("game_over").hit_test(event.pos) == "back":
+                session.reset()
+                current_state = MENU
+    elif event.type == pygame.MOUSEWHEEL:
+        if current_state == CHANGELOGS:
+            scroll_y -= event.y * 20  # Scroll up/down
+            scroll_y = max(0, min(scroll_y, get_changelog_view().max_scroll(get_changelog_viewport(), scale_size(20))))
+    elif event.type == pygame.KEYDOWN:
+        if event.key == PROFILER_KEY:
+            profiler.toggle()
+        elif event.key == pygame.K_ESCAPE and current_state in (PLAYING, PAUSED):
+            if current_state == PLAYING:
+                pause_snapshot = None
+            current_state = PAUSED if current_state == PLAYING else PLAYING
+        elif current_state == PLAYING:
+            handle_game_input(event)
+
+def run_frame(events):
+    """Handle a frame's events, then draw it and advance the animation."""
+    global running
+
+    with profiler.section("handlers"):
+        for event in events:
+            handle_event(event)
     
-    pygame.display.flip()
-    clock.tick(60)
+    if current_state == EXIT:
+        running = False
+    else:
+        render_frame()
+        if current_state != PAUSED:
+            with profiler.section("dots"):
+                particles.update()
+
+def main():
+    """Run the game until the window is closed, checking for updates alongside it."""
+    if PROFILE_CSV:
+        profiler.stream_csv(PROFILE_CSV)
+
+    last_fps_readout = 0
+    first_frame = True
+    while running:
+        profiler.begin_frame()
+        with profiler.section("events"):
+            events = scheduler.poll_events()
+        run_frame(events)
+        profiler.end_frame()
+        if first_frame:
+            first_frame = False
+            mark("first frame")
+            if LAUNCH_PROBE:
+                write_launch_probe()
+                break
+            if SMOKE_TEST:
+                run_smoke_test()
+                break
+            # Only now, so importing the network stack never competes with the first frame
+            start_update_check()
+        scheduler.tick()
+        if SHOW_FPS and pygame.time.get_ticks() - last_fps_readout >= 1000:
+            last_fps_readout = pygame.time.get_ticks()
+            show_fps()
+
+    profiler.close()
+    pygame.quit()
+    sys.exit()
+
+# Main game loop
+scheduler = FrameScheduler(ACTIVE_FPS, IDLE_FPS, BACKGROUND_FPS, IDLE_TIMEOUT)
+running = True
+mark("game state")
 
-pygame.quit()
-sys.exit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
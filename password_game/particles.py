@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Particle System for Project Zozfil
+Array-backed animated dots drawn from a pre-rendered sprite atlas.
+"""
+
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+# Configuration
+MIN_SIZE = 2
+MAX_SIZE = 5
+SPRITE_COLORKEY = (255, 0, 255)
+
+class ParticleSystem:
+    """Dot positions, velocities and sizes stored in NumPy arrays."""
+
+    def __init__(self, count, width, height, color, seed=None):
+        self.color = color
+        self.rng = np.random.default_rng(seed)
+        self.bounds = np.array([width, height], dtype=float)
+        self.atlas, self.sprite_areas = self.render_atlas()
+        self.positions = np.empty((0, 2))
+        self.velocities = np.empty((0, 2))
+        self.sizes = np.empty(0, dtype=int)
+        self.area_list = []
+        self.set_count(count)
+
+    @property
+    def count(self):
+        return len(self.sizes)
+
+    def render_atlas(self):
+        """Pre-render a dot of every radius side by side in one surface.
+
+        Drawing every dot from the same surface lets the texture renderer
+        batch them all into one draw call.
+        """
+        sizes = range(MIN_SIZE, MAX_SIZE + 1)
+        atlas = pygame.Surface((sum(size * 2 for size in sizes), MAX_SIZE * 2))
+        atlas.fill(SPRITE_COLORKEY)
+        areas = {}
+        x = 0
+        for size in sizes:
+            areas[size] = pygame.Rect(x, 0, size * 2, size * 2)
+            pygame.draw.circle(atlas, self.color, (x + size, size), size)
+            x += size * 2
+        atlas.set_colorkey(SPRITE_COLORKEY, pygame.RLEACCEL)
+        return atlas, areas
+
+    def set_count(self, count):
+        """Grow or shrink the system to count particles."""
+        if count < self.count:
+            self.positions = self.positions[:count]
+            self.velocities = self.velocities[:count]
+            self.sizes = self.sizes[:count]
+        elif count > self.count:
+            new = count - self.count
+            positions = self.rng.integers(0, self.bounds + 1, size=(new, 2)).astype(float)
+            velocities = self.rng.uniform(-1, 1, size=(new, 2))
+            sizes = self.rng.integers(MIN_SIZE, MAX_SIZE + 1, size=new)
+            self.positions = np.concatenate([self.positions, positions])
+            self.velocities = np.concatenate([self.velocities, velocities])
+            self.sizes = np.concatenate([self.sizes, sizes])
+        self.area_list = [self.sprite_areas[size] for size in self.sizes.tolist()]
+
+    def resize(self, width, height):
+        """Bounce against a new window size, pulling stray particles back inside."""
+        self.bounds = np.array([width, height], dtype=float)
+        np.clip(self.positions, 0, self.bounds, out=self.positions)
+
+    def update(self):
+        """Move every particle one step and bounce off the edges."""
+        self.positions += self.velocities
+        # Only flip particles heading outward so none get stuck on an edge
+        outward = ((self.positions <= 0) & (self.velocities < 0)) | ((self.positions >= self.bounds) & (self.velocities > 0))
+        self.velocities[outward] *= -1
+
+    def top_lefts(self):
+        """Get the sprite blit positions for the current frame."""
+        centers = self.positions.astype(int)
+        return (centers - self.sizes[:, None]).tolist()
+
+    def rects(self):
+        """Get the screen areas the particles cover this frame."""
+        sizes = (self.sizes * 2).tolist()
+        return [pygame.Rect(x, y, size, size) for (x, y), size in zip(self.top_lefts(), sizes)]
+
+    def draw(self, target):
+        """Draw every particle with a single blits() call."""
+        target.blits(zip(repeat(self.atlas), self.top_lefts(), self.area_list), doreturn=False)
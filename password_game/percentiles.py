@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Percentiles for Project Zozfil
+The one percentile definition shared by the frame profiler and every benchmark report.
+"""
+
+import math
+
+def percentile(ordered, fraction):
+    """Get the nearest-rank percentile of an already sorted list."""
+    # Allow for float error, 0.07 * 100 is 7.000000000000001 and must still be rank 7
+    rank = math.ceil(fraction * len(ordered) - 1e-9)
+    return ordered[max(0, min(len(ordered) - 1, rank - 1))]
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Frame Profiler for Project Zozfil
+Times each phase of a frame and shows rolling percentiles in an overlay.
+"""
+
+import csv
+import queue
+import threading
+import time
+from collections import deque
+
+import pygame
+
+from percentiles import percentile
+
+# Configuration
+ROLLING_WINDOW = 300  # Frames kept for the percentiles
+OVERLAY_REFRESH = 0.25  # Seconds between overlay redraws
+OVERLAY_FONT = "consolas,dejavusansmono,couriernew,monospace"  # Fixed width keeps the columns lined up
+OVERLAY_FONT_SIZE = 14
+OVERLAY_BACKGROUND = (0, 0, 0, 180)
+OVERLAY_COLOR = (0, 255, 0)
+
+class NullSection:
+    """Stand-in section used while the profiler is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+class Section:
+    """Times one phase, excluding any phases nested inside it."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.stack.append([time.perf_counter(), 0.0])
+        return self
+
+    def __exit__(self, *exc_info):
+        start, nested = self.profiler.stack.pop()
+        elapsed = time.perf_counter() - start
+        if self.profiler.stack:
+            self.profiler.stack[-1][1] += elapsed
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed - nested
+        return False
+
+class CsvWriter:
+    """Writes frame samples to a CSV file from a background thread."""
+
+    def __init__(self, path, phases):
+        self.rows = queue.Queue()
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["time"] + [f"{phase}_ms" for phase in phases])
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            row = self.rows.get()
+            if row is None:
+                break
+            self.writer.writerow(row)
+            if self.rows.empty():
+                self.file.flush()
+        self.file.close()
+
+    def close(self):
+        self.rows.put(None)
+        self.thread.join()
+
+class FrameProfiler:
+    """Rolling per-phase frame timings with an on-screen overlay and CSV export."""
+
+    def __init__(self, phases, window=ROLLING_WINDOW):
+        self.phases = phases
+        self.enabled = False
+        self.samples = {phase: deque(maxlen=window) for phase in phases}
+        self.current = {}
+        self.stack = []
+        self.frame_start = 0.0
+        self.csv = None
+        self.null_section = NullSection()
+        self.overlay = None
+        self.overlay_time = 0.0
+
+    def toggle(self):
+        """Turn profiling on or off, starting a fresh window."""
+        self.enabled = not self.enabled
+        for samples in self.samples.values():
+            samples.clear()
+        self.overlay = None
+
+    def stream_csv(self, path):
+        """Append every frame's timings to a CSV file."""
+        self.csv = CsvWriter(path, self.phases)
+
+    def close(self):
+        """Finish writing the CSV file, if one is being written."""
+        if self.csv:
+            self.csv.close()
+            self.csv = None
+
+    def section(self, name):
+        """Get a context manager that times a phase of the current frame."""
+        if not self.enabled:
+            return self.null_section
+        return Section(self, name)
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Record the finished frame's timings."""
+        if not self.enabled:
+            return
+        self.current["frame"] = time.perf_counter() - self.frame_start
+        for phase in self.phases:
+            self.samples[phase].append(self.current.get(phase, 0.0))
+        if self.csv:
+            self.csv.rows.put([f"{time.time():.3f}"] + [f"{self.current.get(phase, 0.0) * 1000:.3f}" for phase in self.phases])
+
+    def stats(self):
+        """Get (p50, p95, p99) in milliseconds for each phase."""
+        stats = {}
+        for phase, samples in self.samples.items():
+            if samples:
+                ordered = sorted(samples)
+                stats[phase] = tuple(percentile(ordered, fraction) * 1000 for fraction in (0.50, 0.95, 0.99))
+        return stats
+
+    def render_overlay(self, font, counters):
+        """Render the percentile table and cache counters."""
+        lines = [f"{'phase':<9}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, (p50, p95, p99) in self.stats().items():
+            lines.append(f"{phase:<9}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        lines.extend(f"{name}: {value}" for name, value in counters.items())
+
+        line_height = font.get_linesize()
+        rendered = [font.render(line, True, OVERLAY_COLOR) for line in lines]
+        width = max(text.get_width() for text in rendered) + 10
+        overlay = pygame.Surface((width, line_height * len(rendered) + 10), pygame.SRCALPHA)
+        overlay.fill(OVERLAY_BACKGROUND)
+        for i, text in enumerate(rendered):
+            overlay.blit(text, (5, 5 + i * line_height))
+        return overlay
+
+    def draw_overlay(self, target, font, counters, pos=(10, 10)):
+        """Draw the overlay, refreshing its contents a few times a second."""
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_time >= OVERLAY_REFRESH:
+            self.overlay = self.render_overlay(font, counters)
+            self.overlay_time = now
+        return target.blit(self.overlay, pos)
@@ -5,14 +5,158 @@ Generates update packages and pushes them to the update server.
 """
 
 import os
+import sys
 import json
-import shutil
-import zipfile
+import hashlib
+import argparse
 import subprocess
 
+from checksums import file_sha256
+from delta_builder import create_patch
+from compression import available_encodings, compress_file
+from release_store import ReleaseStore, OBJECTS_DIR
+from update_client import parse_version
+
 # Configuration
 UPDATE_DIR = "updates"
 VERSION_FILE = "version.json"
+INDEX_FILE = "releases.json"  # In UPDATE_DIR, the kept releases and the objects each is made of
+ARTIFACTS = {"app": "dist/app.exe", "updater": "dist/updater.exe"}
+ONEDIR = "dist/app_onedir"  # Startup-optimized app folder, published file by file when it was built
+DELTA_SOURCES = 3  # Most recent releases that get a patch straight to the new version
+KEEP_RELEASES = 10  # Releases kept downloadable, older ones are pruned along with their patches
+
+def release_versions():
+    """List the versions with an app exe in the updates directory, oldest first."""
+    versions = []
+    for name in os.listdir(UPDATE_DIR):
+        version, ext = os.path.splitext(name)
+        if ext != ".exe" or version.startswith("updater_"):
+            continue
+        try:
+            parse_version(version)
+        except ValueError:
+            continue
+        versions.append(version)
+    return sorted(versions, key=parse_version)
+
+def release_names(version):
+    """Get the names a release's artifacts are published under."""
+    return {"app": f"{version}.exe", "updater": f"updater_{version}.exe"}
+
+def tree_hashes(directory):
+    """Hash every file under directory, keyed by its path relative to it with forward slashes."""
+    hashes = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            hashes[os.path.relpath(path, directory).replace(os.sep, "/")] = file_sha256(path)
+    return dict(sorted(hashes.items()))
+
+def tree_sha256(hashes):
+    """Hash a whole folder from its file hashes, so any renamed, added or changed file changes it."""
+    return hashlib.sha256(json.dumps(hashes).encode()).hexdigest()
+
+def add_tree(store, directory, hashes):
+    """Store each file of a folder and describe the folder for the manifest."""
+    files = []
+    new_files = 0
+    for relative, sha256 in hashes.items():
+        new_files += not store.has(sha256)
+        stored = store.add(os.path.join(directory, *relative.split("/")), available_encodings(), sha256)
+        files.append({"path": relative, "file": stored["file"], "size": stored["size"], "sha256": sha256})
+    print(f"Update onedir: {len(files)} files, {new_files} new")
+    return {"sha256": tree_sha256(hashes), "size": sum(entry["size"] for entry in files), "files": files}
+
+def write_json(path, data):
+    """Replace a JSON file in one step, so the server never sends half of it."""
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def load_releases(store):
+    """Get the kept releases, oldest first, moving exes published before the store into it."""
+    try:
+        with open(os.path.join(UPDATE_DIR, INDEX_FILE), "r") as f:
+            return json.load(f)["releases"]
+    except (OSError, ValueError, KeyError):
+        pass
+    releases = []
+    for version in release_versions():
+        release = {"version": version}
+        for key, name in release_names(version).items():
+            if os.path.exists(os.path.join(UPDATE_DIR, name)):
+                release[key] = store.add(os.path.join(UPDATE_DIR, name))
+        releases.append(release)
+    return releases
+
+def load_patches(store, manifest, releases):
+    """Get the previous manifest's patches that are still in the store, moving older patch files into it."""
+    app_hashes = {release["version"]: release["app"]["sha256"] for release in releases if "app" in release}
+    patches = []
+    for patch in manifest.get("patches", []):
+        patch_path = os.path.join(UPDATE_DIR, patch["file"])
+        if not patch["file"].startswith(f"{OBJECTS_DIR}/") and os.path.exists(patch_path):
+            patch["file"] = store.add(patch_path, sha256=patch["sha256"])["file"]
+            os.remove(patch_path)
+        # Patches are reused by content, so they need to know what they apply to
+        patch.setdefault("source_sha256", app_hashes.get(patch["from"]))
+        if store.has(patch["sha256"]):
+            patches.append(patch)
+    return patches
+
+def make_patches(store, releases, release, patches):
+    """Add patches from the last few releases to the new one, reusing any built for the same content."""
+    target_sha256 = release["app"]["sha256"]
+    built = {(patch["source_sha256"], patch["target_sha256"]): patch for patch in patches}
+    for earlier in releases[-DELTA_SOURCES:]:
+        source_sha256 = earlier.get("app", {}).get("sha256")
+        # Installs with the same content as the new release just need the version bump
+        if not source_sha256 or source_sha256 == target_sha256 or not store.has(source_sha256):
+            continue
+        patch = built.get((source_sha256, target_sha256))
+        if patch:
+            print(f"Update patch: {earlier['version']} -> {release['version']} reuses {patch['file']}")
+        else:
+            temp_path = os.path.join(UPDATE_DIR, "update.patch.tmp")
+            create_patch(store.object_path(source_sha256), store.object_path(target_sha256), temp_path)
+            stored = store.add(temp_path)
+            os.remove(temp_path)
+            patch = {"file": stored["file"], "size": stored["size"], "sha256": stored["sha256"],
+                     "source_sha256": source_sha256, "target_sha256": target_sha256}
+            built[(source_sha256, target_sha256)] = patch
+            print(f"Update patch: {earlier['version']} -> {release['version']} ({patch['size']} bytes)")
+        patches.append(dict(patch, **{"from": earlier["version"], "to": release["version"]}))
+
+parser = argparse.ArgumentParser(description="Publish dist/ as the next Project Zozfil update.")
+parser.add_argument("--keep", type=int, default=KEEP_RELEASES, help="releases to keep downloadable")
+parser.add_argument("--no-push", action="store_true", help="publish into updates/ without committing and pushing")
+args = parser.parse_args()
+if args.keep < 1:
+    parser.error("--keep must be at least 1")
+
+# Create update directory
+os.makedirs(UPDATE_DIR, exist_ok=True)
+store = ReleaseStore(UPDATE_DIR)
+manifest_path = os.path.join(UPDATE_DIR, "latest_version.json")
+try:
+    with open(manifest_path, "r") as f:
+        previous_manifest = json.load(f)
+except (OSError, ValueError):
+    previous_manifest = {}
+releases = load_releases(store)
+patches = load_patches(store, previous_manifest, releases)
+previous = releases[-1] if releases else {}
+
+# Hash the build first, artifacts missing from dist/ carry over from the previous release
+hashes = {key: file_sha256(path) for key, path in ARTIFACTS.items() if os.path.exists(path)}
+if os.path.isdir(ONEDIR):
+    onedir_hashes = tree_hashes(ONEDIR)
+    hashes["onedir"] = tree_sha256(onedir_hashes)
+changed = [key for key, sha256 in hashes.items() if previous.get(key, {}).get("sha256") != sha256]
+if not changed:
+    print(f"dist/ matches release {previous.get('version', 'none')}, nothing to publish.")
+    sys.exit(0)
 
 # Load current version
 with open(VERSION_FILE, "r") as f:
@@ -24,38 +168,76 @@ new_version_parts = current_version.split(".")
 new_version_parts[-1] = str(int(new_version_parts[-1]) + 1)
 new_version = ".".join(new_version_parts)
 
-# Create update directory
-os.makedirs(UPDATE_DIR, exist_ok=True)
-
 # Update the version file
 with open(VERSION_FILE, "w") as f:
     json.dump({"version": new_version}, f)
 
-# Create a latest_version.json file
-with open(os.path.join(UPDATE_DIR, "latest_version.json"), "w") as f:
-    json.dump({"version": new_version}, f)
+# Store the new artifacts, content already in the store is neither copied nor compressed again
+release = {"version": new_version}
+for key, path in ARTIFACTS.items():
+    if key in hashes:
+        # Compress the app once here so the server never has to compress per request
+        release[key] = store.add(path, available_encodings() if key == "app" else (), hashes[key])
+        print(f"Update {key}: {release[key]['file']} ({'changed' if key in changed else 'unchanged'})")
+        for encoding, size in release[key]["variants"].items():
+            print(f"Update {key} variant: {encoding} ({size} bytes)")
+    elif key in previous:
+        release[key] = previous[key]
+# Files shared with earlier builds, such as the interpreter and SDL, are stored once for all of them
+if "onedir" in hashes:
+    release["onedir"] = add_tree(store, ONEDIR, onedir_hashes)
+elif "onedir" in previous:
+    release["onedir"] = previous["onedir"]
+if "app" in release:
+    make_patches(store, releases, release, patches)
+releases.append(release)
+
+# Prune releases past the retention limit, with their patches and any content only they used
+kept = releases[-args.keep:]
+kept_versions = {release["version"] for release in kept}
+for dropped in releases[:-args.keep]:
+    for name in release_names(dropped["version"]).values():
+        store.unpublish(name)
+    print(f"Pruned release {dropped['version']}")
+patches = [patch for patch in patches if patch["from"] in kept_versions and patch["to"] in kept_versions]
 
-# Copy app.exe to updates as the versioned exe
-if os.path.exists("dist/app.exe"):
-    shutil.copy("dist/app.exe", os.path.join(UPDATE_DIR, f"{new_version}.exe"))
-    print(f"Update exe: {os.path.join(UPDATE_DIR, f'{new_version}.exe')}")
+# Versioned names stay downloadable for updaters that predate the object paths
+for kept_release in kept:
+    for key, name in release_names(kept_release["version"]).items():
+        if key in kept_release:
+            store.publish(kept_release[key]["sha256"], name)
 
-# Copy updater.exe if it exists
-if os.path.exists("dist/updater.exe"):
-    shutil.copy("dist/updater.exe", os.path.join(UPDATE_DIR, f"updater_{new_version}.exe"))
-    print(f"Update updater: {os.path.join(UPDATE_DIR, f'updater_{new_version}.exe')}")
+live = {kept_release[key]["sha256"] for kept_release in kept for key in ARTIFACTS if key in kept_release}
+live.update(patch["sha256"] for patch in patches)
+live.update(entry["sha256"] for kept_release in kept for entry in kept_release.get("onedir", {}).get("files", []))
+freed = store.collect_garbage(live)
+if freed:
+    print(f"Freed {freed} bytes of unused objects")
+
+# Create a latest_version.json file, with where to get each artifact and the size and hash the updater checks against
+manifest = {"version": new_version}
+manifest.update(release.get("app", {}))
+if "updater" in release:
+    manifest["updater"] = release["updater"]
+if "onedir" in release:
+    manifest["onedir"] = release["onedir"]
+manifest["patches"] = patches
+write_json(manifest_path, manifest)
+# Only gzip for the manifest, which every HTTP client decodes on its own
+compress_file(manifest_path, ["gzip"])
+write_json(os.path.join(UPDATE_DIR, INDEX_FILE), {"releases": kept})
 
 print(f"Update {new_version} generated successfully!")
-print(f"Latest version file: {os.path.join(UPDATE_DIR, 'latest_version.json')}")
+print(f"Latest version file: {manifest_path}")
+
+if args.no_push:
+    sys.exit(0)
 
 # Automatically commit and push to GitHub
 print("Committing and pushing to GitHub...")
 try:
-    # Find git root
-    result = subprocess.run(["git", "rev-parse", "--show-toplevel"], capture_output=True, text=True, check=True)
-    git_root = result.stdout.strip()
-    os.chdir(git_root)
-    subprocess.run(["git", "add", "."], check=True)
+    # Only the release, so stray build output never gets committed; --all records pruned files too
+    subprocess.run(["git", "add", "--all", "--", UPDATE_DIR, VERSION_FILE], check=True)
     subprocess.run(["git", "commit", "-m", f"Update to version {new_version}"], check=True)
     subprocess.run(["git", "push"], check=True)
 except subprocess.CalledProcessError:
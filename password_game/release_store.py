@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Release Store for Project Zozfil
+Content-addressed storage for update artifacts, shared between releases through hardlinks.
+"""
+
+import os
+import shutil
+
+from checksums import file_sha256
+from compression import SUFFIXES, compress_file
+
+# Configuration
+OBJECTS_DIR = "objects"  # Under the updates directory, one file per distinct content
+
+class ReleaseStore:
+    """Keeps each distinct artifact once, named by its SHA-256.
+
+    Objects live at objects/<first two hex digits>/<sha256> with their
+    precompressed variants next to them, so the update server can serve
+    and negotiate them like any other file. Release names such as
+    1.0.9.exe are published as hardlinks to the objects and cost no space.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def object_name(self, sha256):
+        """Get an object's path relative to the updates directory, as it appears in URLs."""
+        return f"{OBJECTS_DIR}/{sha256[:2]}/{sha256}"
+
+    def object_path(self, sha256):
+        return os.path.join(self.directory, OBJECTS_DIR, sha256[:2], sha256)
+
+    def has(self, sha256):
+        return os.path.exists(self.object_path(sha256))
+
+    def add(self, path, encodings=(), sha256=None):
+        """Store path under its hash unless that content is already stored, and describe the object.
+
+        New objects get a precompressed copy for each encoding. The copy
+        and its variants are written under temporary names and moved in
+        last, so an interrupted publish never leaves a partial object.
+        """
+        sha256 = sha256 or file_sha256(path)
+        target = self.object_path(sha256)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            temp_path = f"{target}.tmp"
+            shutil.copyfile(path, temp_path)
+            # Variants are written after the copy, so the server never takes them for stale
+            for variant_path in compress_file(temp_path, encodings) if encodings else []:
+                os.replace(variant_path, target + variant_path[len(temp_path):])
+            os.replace(temp_path, target)
+        return self.describe(sha256)
+
+    def describe(self, sha256):
+        """Get the manifest entry for a stored object: where it is, its size, hash and variants."""
+        target = self.object_path(sha256)
+        variants = {}
+        for encoding, suffix in SUFFIXES.items():
+            if os.path.exists(target + suffix):
+                variants[encoding] = os.path.getsize(target + suffix)
+        return {"file": self.object_name(sha256), "size": os.path.getsize(target), "sha256": sha256, "variants": variants}
+
+    def publish(self, sha256, name):
+        """Make an object and its variants downloadable under name as well."""
+        target = self.object_path(sha256)
+        for suffix in [""] + list(SUFFIXES.values()):
+            link_path = os.path.join(self.directory, name + suffix)
+            if not os.path.exists(target + suffix):
+                self.remove(name + suffix)
+                continue
+            if os.path.exists(link_path) and os.path.samefile(link_path, target + suffix):
+                continue
+            self.remove(name + suffix)
+            try:
+                os.link(target + suffix, link_path)
+            except OSError:
+                # Filesystems without hardlinks get a plain copy, keeping the object's mtime
+                shutil.copy2(target + suffix, link_path)
+
+    def unpublish(self, name):
+        """Remove a release name and its variants, leaving the objects."""
+        for suffix in [""] + list(SUFFIXES.values()):
+            self.remove(name + suffix)
+
+    def remove(self, name):
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def collect_garbage(self, live):
+        """Delete every object whose hash is not in live. Returns the bytes freed."""
+        freed = 0
+        objects_dir = os.path.join(self.directory, OBJECTS_DIR)
+        if not os.path.isdir(objects_dir):
+            return freed
+        for prefix in os.listdir(objects_dir):
+            prefix_dir = os.path.join(objects_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                # Variants and leftover temporary files go with their object
+                if name.split(".", 1)[0] not in live:
+                    freed += os.path.getsize(os.path.join(prefix_dir, name))
+                    os.remove(os.path.join(prefix_dir, name))
+            if not os.listdir(prefix_dir):
+                os.rmdir(prefix_dir)
+        return freed
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Startup Trace for Project Zozfil
+Timestamps each phase of startup when ZOZFIL_STARTUP_TRACE is set.
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Configuration
+TRACE = os.environ.get("ZOZFIL_STARTUP_TRACE")  # "1" for stderr, anything else is a file to append to
+
+def process_age():
+    """Get the seconds since this process was created, covering interpreter start-up, or None if unknown."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            kernel32 = ctypes.windll.kernel32
+            creation, exited, kernel, user, now = (wintypes.FILETIME() for _ in range(5))
+            if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), ctypes.byref(creation), ctypes.byref(exited), ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+            # FILETIMEs count 100 ns intervals
+            ticks = lambda filetime: (filetime.dwHighDateTime << 32) | filetime.dwLowDateTime
+            return (ticks(now) - ticks(creation)) / 1e7
+        with open("/proc/self/stat", "r") as f:
+            # Fields after the command name, which may contain spaces; the start time is the 22nd field
+            start_ticks = int(f.read().rpartition(")")[2].split()[19])
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def write(line):
+    if TRACE == "1":
+        # Windowed builds have no stderr
+        if sys.stderr:
+            print(line, file=sys.stderr, flush=True)
+    else:
+        with open(TRACE, "a") as f:
+            f.write(line + "\n")
+
+class StartupTrace:
+    """Prints, like -X importtime, each phase's own time and the time since the process started, in microseconds."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start = time.perf_counter()
+        self.last = self.start
+        age = process_age() if TRACE else None
+        self.offset = age or 0.0
+        if TRACE:
+            write("startup: self [us] | cumulative | phase")
+            if age is not None:
+                write(f"startup: {age * 1e6:10.0f} | {age * 1e6:10.0f} | interpreter")
+
+    def mark(self, phase):
+        """Record that a phase of startup just finished."""
+        if not TRACE:
+            return
+        with self.lock:
+            now = time.perf_counter()
+            write(f"startup: {(now - self.last) * 1e6:10.0f} | {(now - self.start + self.offset) * 1e6:10.0f} | {phase}")
+            self.last = now
+
+trace = StartupTrace()
+mark = trace.mark
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Text Layout for Project Zozfil
+Word wrapping with cached word widths and memoized layouts.
+"""
+
+import weakref
+from collections import OrderedDict
+
+# Configuration
+LAYOUT_CACHE_SIZE = 64  # Wrapped layouts kept per font
+
+class FontMetrics:
+    """Word widths and recent layouts measured with one font."""
+
+    def __init__(self, font):
+        self.font = font
+        self.space_width = font.size(" ")[0]
+        self.word_widths = {}
+        self.layouts = OrderedDict()
+
+    def word_width(self, word):
+        width = self.word_widths.get(word)
+        if width is None:
+            width = self.font.size(word)[0]
+            self.word_widths[word] = width
+        return width
+
+class TextLayout:
+    """Wraps text to a width, measuring each distinct word only once per font."""
+
+    def __init__(self, cache_size=LAYOUT_CACHE_SIZE):
+        self.cache_size = cache_size
+        # Dropped along with the font when the font cache evicts it
+        self.metrics = weakref.WeakKeyDictionary()
+
+    def get_metrics(self, font):
+        metrics = self.metrics.get(font)
+        if metrics is None:
+            metrics = FontMetrics(font)
+            self.metrics[font] = metrics
+        return metrics
+
+    def wrap(self, text, font, max_width):
+        """Wrap text to fit within max_width, reusing the last layout of the same text."""
+        metrics = self.get_metrics(font)
+        key = (text, max_width)
+        lines = metrics.layouts.get(key)
+        if lines is not None:
+            metrics.layouts.move_to_end(key)
+            return lines
+
+        lines = []
+        words = text.split(' ')
+        start = 0
+        while start < len(words):
+            # Every word is measured with its trailing space, as the line would be
+            end = start
+            line_width = 0
+            while end < len(words):
+                word_width = metrics.word_width(words[end]) + metrics.space_width
+                if line_width + word_width > max_width and end > start:
+                    break
+                line_width += word_width
+                end += 1
+            # Summed widths miss kerning and rounding, so measure the whole line once and move overflowing words down
+            while end - start > 1 and font.size(' '.join(words[start:end]) + ' ')[0] > max_width:
+                end -= 1
+            lines.append(' '.join(words[start:end]).strip())
+            start = end
+
+        metrics.layouts[key] = lines
+        if len(metrics.layouts) > self.cache_size:
+            metrics.layouts.popitem(last=False)
+        return lines
+
+    def wrap_many(self, texts, font, max_width):
+        """Wrap several texts with the same font and width."""
+        return [self.wrap(text, font, max_width) for text in texts]
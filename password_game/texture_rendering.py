@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Texture Rendering for Project Zozfil
+Draws the game with SDL2's 2D renderer, uploading each surface once as a texture.
+"""
+
+import weakref
+
+import pygame
+from pygame._sdl2.video import Window, Renderer, Texture, get_drivers
+
+class TextureScreen:
+    """A window drawn through an SDL Renderer that stands in for the display surface.
+
+    It implements the part of the Surface API the draw functions use:
+    get_size, get_rect, fill, blit, blits, get_clip and set_clip. Every
+    surface blitted is uploaded to a texture on first use and the texture
+    is dropped along with the surface, so surfaces must not be changed
+    after they were first drawn. Each frame is a run of texture copies,
+    which SDL batches into as few draw calls as it can.
+    """
+
+    def __init__(self, title, size, driver=None):
+        self.window = Window(title, size, resizable=True)
+        self.renderer = Renderer(self.window, index=self.driver_index(driver), vsync=False)
+        self.textures = weakref.WeakKeyDictionary()
+        self.clip = None
+        self.fullscreen = False
+
+    @staticmethod
+    def driver_index(name):
+        """Find the render driver called name, e.g. "software", or let SDL pick the best one."""
+        if not name:
+            return -1
+        names = [driver.name for driver in get_drivers()]
+        if name not in names:
+            raise ValueError(f"unknown render driver {name}, available: {', '.join(names)}")
+        return names.index(name)
+
+    def set_mode(self, size, fullscreen):
+        """Resize the window or switch it in or out of fullscreen."""
+        if fullscreen != self.fullscreen:
+            self.fullscreen = fullscreen
+            if fullscreen:
+                self.window.set_fullscreen()
+            else:
+                self.window.set_windowed()
+        if tuple(self.window.size) != tuple(size):
+            self.window.size = size
+        # SDL only refits the viewport once it sees the resize event, reset it so this frame already fills the window
+        self.renderer.set_viewport(None)
+        # Unclipped, like a new display surface
+        self.clip = None
+
+    def set_caption(self, title):
+        self.window.title = title
+
+    def get_size(self):
+        return self.renderer.get_viewport().size
+
+    def get_rect(self):
+        return pygame.Rect((0, 0), self.get_size())
+
+    def get_clip(self):
+        return self.clip or self.get_rect()
+
+    def set_clip(self, rect):
+        # Clipping to the whole screen is no clipping, which keeps blits() on its fast path
+        self.clip = pygame.Rect(rect) if rect and pygame.Rect(rect) != self.get_rect() else None
+
+    def get_texture(self, surface):
+        """Get the texture for a surface, uploading it on first use."""
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+        return texture
+
+    def fill(self, color, rect=None):
+        """Fill an area with a solid color, replacing what was there as Surface.fill does."""
+        self.renderer.draw_color = pygame.Color(color)
+        if rect is None and self.clip is None:
+            self.renderer.clear()
+        else:
+            self.renderer.fill_rect(self.get_clip().clip(rect or self.get_rect()))
+
+    def blit(self, surface, dest, area=None):
+        """Copy a surface, or the area of it, to dest and return the rect drawn."""
+        texture = self.get_texture(surface)
+        source = pygame.Rect(area) if area else pygame.Rect(0, 0, texture.width, texture.height)
+        drawn = pygame.Rect(dest[0], dest[1], source.width, source.height)
+        clipped = drawn.clip(self.get_clip())
+        if clipped.size != drawn.size:
+            source = pygame.Rect(source.x + clipped.x - drawn.x, source.y + clipped.y - drawn.y, clipped.width, clipped.height)
+        if clipped:
+            texture.draw(source, clipped)
+        return clipped
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Copy many (surface, dest) or (surface, dest, area) items, e.g. sprites from one atlas."""
+        if self.clip is not None or doreturn:
+            rects = [self.blit(*item) for item in blit_sequence]
+            return rects if doreturn else None
+        # Unclipped fast path, one texture lookup per run of the same surface
+        last_surface = texture = None
+        for item in blit_sequence:
+            surface, dest = item[0], item[1]
+            if surface is not last_surface:
+                last_surface = surface
+                texture = self.get_texture(surface)
+            if len(item) > 2:
+                area = item[2]
+                texture.draw(area, (dest[0], dest[1], area[2], area[3]))
+            else:
+                texture.draw(None, (dest[0], dest[1], texture.width, texture.height))
+        return None
+
+    def present(self):
+        """Show the frame drawn since the last present."""
+        self.renderer.present()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+UI Layout for Project Zozfil
+Retained button layouts shared by the draw functions and click handlers.
+"""
+
+import pygame
+
+# Configuration
+BUTTON_PADDING = 20
+BUTTON_BORDER = 2
+
+class Button:
+    """A text label inside a bordered box, centered horizontally."""
+
+    def __init__(self, action, text_surface, center_x, top, color, padding=BUTTON_PADDING):
+        self.action = action
+        self.text_surface = text_surface
+        self.color = color
+        width = text_surface.get_width() + padding
+        height = text_surface.get_height() + 10
+        self.rect = pygame.Rect(center_x - width // 2, top, width, height)
+        self.surface = self.render()
+
+    def render(self):
+        """Pre-render the box and label into one surface, drawn with a single blit."""
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, self.color, surface.get_rect(), BUTTON_BORDER)
+        text_rect = self.text_surface.get_rect(center=surface.get_rect().center)
+        surface.blit(self.text_surface, text_rect)
+        return surface
+
+    def draw(self, target):
+        """Draw the button box and label."""
+        target.blit(self.surface, self.rect)
+
+class Layout:
+    """The buttons of one screen with their rects computed up front."""
+
+    def __init__(self, buttons):
+        self.buttons = buttons
+        self.rects = [button.rect for button in buttons]
+        self.actions = [button.action for button in buttons]
+
+    def draw(self, target):
+        """Draw every button in the layout."""
+        for button in self.buttons:
+            button.draw(target)
+
+    def hit_test(self, pos):
+        """Return the action of the button under pos, or None."""
+        index = pygame.Rect(pos, (1, 1)).collidelist(self.rects)
+        if index == -1:
+            return None
+        return self.actions[index]
+
+class LayoutCache:
+    """Layouts keyed by screen name, rebuilt after the window is resized."""
+
+    def __init__(self):
+        self.layouts = {}
+
+    def get(self, name, build):
+        """Return the layout for name, calling build() if it isn't cached."""
+        layout = self.layouts.get(name)
+        if layout is None:
+            layout = build()
+            self.layouts[name] = layout
+        return layout
+
+    def invalidate(self):
+        """Drop every layout, e.g. when the window size changes."""
+        self.layouts.clear()
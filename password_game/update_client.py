@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Update Client for Project Zozfil
+Shared access to the update server with pooled connections and a cached manifest.
+"""
+
+import os
+import re
+import json
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Configuration
+UPDATE_URL = "http://localhost:8000/"
+MANIFEST_NAME = "latest_version.json"
+CACHE_FILE = "update_cache.json"
+CACHE_TTL = 6 * 60 * 60  # Seconds a cached manifest is trusted before asking the server again
+TIMEOUT = (3, 5)  # Seconds to connect and to wait for the response
+POOL_SIZE = 8  # Connections kept open per host
+RETRIES = 2  # Retries of a GET or HEAD whose connection dropped, e.g. a kept-alive one the server just closed
+
+VERSION_PATTERN = re.compile(r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:-([0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$")
+
+def parse_version(version):
+    """Parse a semantic version into a tuple that compares in release order.
+
+    Missing minor and patch numbers count as 0, pre-releases sort before
+    their release and build metadata is ignored.
+    """
+    match = VERSION_PATTERN.match(version.strip())
+    if not match:
+        raise ValueError(f"Invalid version: {version!r}")
+    major, minor, patch, prerelease = match.groups()
+    if prerelease:
+        # Numeric identifiers sort numerically and before alphanumeric ones
+        identifiers = tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in prerelease.split("."))
+        release = (0, identifiers)
+    else:
+        release = (1, ())
+    return (int(major), int(minor or 0), int(patch or 0), release)
+
+def is_newer(version, current_version):
+    """Check whether version is a later release than current_version."""
+    return parse_version(version) > parse_version(current_version)
+
+class UpdateClient:
+    """Talks to the update server over a pooled session, revalidating a cached manifest."""
+
+    def __init__(self, base_url=UPDATE_URL, cache_file=CACHE_FILE, cache_ttl=CACHE_TTL, timeout=TIMEOUT):
+        self.base_url = base_url
+        self.cache_file = cache_file
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.manifest = None  # Last manifest returned by get_manifest
+        self.session = requests.Session()
+        retries = Retry(total=RETRIES, backoff_factor=0.1, allowed_methods=frozenset({"GET", "HEAD"}), status_forcelist=())
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, name):
+        return f"{self.base_url}{name}"
+
+    def get(self, name, **kwargs):
+        """Request a file from the update server over the pooled session."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(self.url(name), **kwargs)
+
+    def load_cache(self):
+        """Get the cached manifest entry for this server, if there is one."""
+        try:
+            with open(self.cache_file, "r") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cache.get("url") != self.url(MANIFEST_NAME):
+            return None
+        return cache
+
+    def save_cache(self, cache):
+        """Write the cache through a temporary file so a crash never leaves half of it."""
+        temp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(temp_file, "w") as f:
+                json.dump(cache, f)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            print(f"Error saving update cache: {e}")
+
+    def get_manifest(self, max_age=None):
+        """Get the latest release manifest.
+
+        A cached copy younger than max_age seconds (cache_ttl by default)
+        is returned without touching the network. Older copies are
+        revalidated with a conditional request, so an unchanged manifest
+        only costs a 304.
+        """
+        if max_age is None:
+            max_age = self.cache_ttl
+        cache = self.load_cache()
+        now = time.time()
+        if cache and 0 <= now - cache["fetched"] < max_age:
+            self.manifest = cache["manifest"]
+            return self.manifest
+
+        headers = {}
+        if cache and cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache and cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
+        response = self.get(MANIFEST_NAME, headers=headers)
+        if response.status_code == 304 and cache:
+            cache["fetched"] = now
+            self.save_cache(cache)
+            self.manifest = cache["manifest"]
+            return self.manifest
+
+        response.raise_for_status()
+        self.manifest = response.json()
+        self.save_cache({
+            "url": self.url(MANIFEST_NAME),
+            "fetched": now,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "manifest": self.manifest,
+        })
+        return self.manifest
+
+    def check_for_updates(self, current_version, max_age=None):
+        """Get the latest version if it is newer than current_version, otherwise None."""
+        latest_version = self.get_manifest(max_age).get("version", current_version)
+        return latest_version if is_newer(latest_version, current_version) else None
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Update HTTP Server for Project Zozfil
+Threaded file server for the updates folder with ranges, validators and keep-alive.
+"""
+
+import os
+import sys
+import time
+import select
+import threading
+import mimetypes
+import email.utils
+import http.server
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+from compression import SUFFIXES
+
+# Configuration
+MAX_CONNECTIONS = 256  # Connections served at once, the rest wait in the listen backlog
+LISTEN_BACKLOG = 512
+KEEPALIVE_TIMEOUT = 15  # Seconds an idle connection is kept open
+IDLE_POLL = 0.25  # Seconds between checks for queued connections while idle
+SENDFILE_CHUNK = 8 * 1024 * 1024  # Bytes handed to sendfile per call
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60  # Versioned artifacts never change once published
+MUTABLE_SUFFIXES = (".json",)  # Files rewritten in place, always revalidated
+
+def parse_range(header, size):
+    """Parse a single byte range into (start, end) with end exclusive.
+
+    Returns None when the header should be ignored (missing, malformed or
+    several ranges) and raises ValueError when the range is unsatisfiable.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, separator, last = header[len("bytes="):].strip().partition("-")
+    if not separator or (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:
+        # Suffix range, the last N bytes
+        if not last:
+            return None
+        if int(last) == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - int(last)), size
+    start = int(first)
+    end = int(last) + 1 if last else size
+    if last and end <= start:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, min(end, size)
+
+def parse_accept_encoding(header):
+    """Get the content-codings an Accept-Encoding header allows."""
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+class UpdateRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves files from the server's directory over persistent HTTP/1.1 connections."""
+
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    server_version = "ZozfilUpdateServer/1.0"
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self.wait_for_request():
+            self.handle_one_request()
+
+    def wait_for_request(self):
+        """Wait for the next request on a kept-alive connection.
+
+        Gives up early when other connections are queued for a slot, so
+        idle keep-alive connections never starve new clients.
+        """
+        if self.request_buffered():
+            return True
+        deadline = time.monotonic() + KEEPALIVE_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self.server.waiting:
+                return False
+            # Readable also covers the client closing, which handle_one_request notices
+            if select.select([self.connection], [], [], min(IDLE_POLL, remaining))[0]:
+                return True
+
+    def request_buffered(self):
+        """Check, without blocking, whether a pipelined request has already been read in."""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_GET(self):
+        self.send_file(head_only=False)
+
+    def do_HEAD(self):
+        self.send_file(head_only=True)
+
+    def log_message(self, format, *args):
+        # pythonw has no stderr to log to
+        if not self.server.quiet and sys.stderr:
+            super().log_message(format, *args)
+
+    def translate_path(self):
+        """Map the request path to a file inside the served directory, or None."""
+        path = unquote(urlsplit(self.path).path).lstrip("/")
+        full_path = os.path.normpath(os.path.join(self.server.directory, path))
+        if os.path.commonpath([full_path, self.server.directory]) != self.server.directory:
+            return None
+        return full_path
+
+    def is_not_modified(self, etag, mtime):
+        """Check the request's validators against the file's."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def negotiate(self, path, stat):
+        """Pick the smallest up-to-date precompressed variant the client accepts.
+
+        Returns the content-coding and the file to send, which is the
+        original file with no coding when nothing better fits.
+        """
+        accepted = parse_accept_encoding(self.headers.get("Accept-Encoding"))
+        best = (None, path, stat.st_size)
+        for encoding, suffix in SUFFIXES.items():
+            if encoding not in accepted and "*" not in accepted:
+                continue
+            try:
+                variant = os.stat(path + suffix)
+            except OSError:
+                continue
+            # A variant older than the original was left over from a previous publish
+            if variant.st_mtime >= stat.st_mtime and variant.st_size < best[2]:
+                best = (encoding, path + suffix, variant.st_size)
+        return best[:2]
+
+    def range_applies(self, etag, last_modified):
+        """Check that If-Range, when sent, still names this version of the file."""
+        if_range = self.headers.get("If-Range")
+        return not if_range or if_range in (etag, last_modified)
+
+    def send_file(self, head_only):
+        """Send a file, a byte range of it or a 304, with its validators."""
+        path = self.translate_path()
+        try:
+            stat = os.stat(path) if path else None
+            encoding, send_path = self.negotiate(path, stat) if stat else (None, None)
+            f = open(send_path, "rb") if send_path and os.path.isfile(send_path) else None
+        except OSError:
+            f = None
+        if f is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        with f:
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            # Each variant gets its own tag, ranges and validators apply to the bytes sent
+            etag = f'"{stat.st_mtime_ns:x}-{size:x}{"-" + encoding if encoding else ""}"'
+            last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+
+            if self.is_not_modified(etag, stat.st_mtime):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_validators(path, etag, last_modified)
+                self.end_headers()
+                return
+
+            start, end = 0, size
+            status = HTTPStatus.OK
+            if self.range_applies(etag, last_modified):
+                try:
+                    byte_range = parse_range(self.headers.get("Range"), size)
+                except ValueError:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if byte_range:
+                    start, end = byte_range
+                    status = HTTPStatus.PARTIAL_CONTENT
+
+            self.send_response(status)
+            self.send_header("Content-Type", mimetypes.guess_type(path)[0] or "application/octet-stream")
+            self.send_header("Content-Length", str(end - start))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.send_header("Accept-Ranges", "bytes")
+            if status == HTTPStatus.PARTIAL_CONTENT:
+                self.send_header("Content-Range", f"bytes {start}-{end - 1}/{size}")
+            self.send_validators(path, etag, last_modified)
+            self.end_headers()
+
+            if not head_only:
+                self.send_body(f, start, end - start)
+
+    def send_validators(self, path, etag, last_modified):
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if path.endswith(MUTABLE_SUFFIXES):
+            self.send_header("Cache-Control", "no-cache")
+        else:
+            self.send_header("Cache-Control", f"public, max-age={IMMUTABLE_MAX_AGE}, immutable")
+
+    def send_body(self, f, offset, count):
+        """Copy part of a file to the socket, zero-copy through sendfile where the OS has it."""
+        while count > 0:
+            sent = self.connection.sendfile(f, offset, min(count, SENDFILE_CHUNK))
+            if not sent:
+                raise ConnectionError("Client stopped reading")
+            offset += sent
+            count -= sent
+
+class UpdateServer(http.server.ThreadingHTTPServer):
+    """Thread-per-connection server that serves at most max_connections at once."""
+
+    daemon_threads = True
+    block_on_close = False
+    request_queue_size = LISTEN_BACKLOG
+
+    def __init__(self, address, directory, max_connections=MAX_CONNECTIONS, quiet=False):
+        self.directory = os.path.abspath(directory)
+        self.quiet = quiet
+        self.slots = threading.BoundedSemaphore(max_connections)
+        self.waiting = 0  # Connections accepted but waiting for a slot
+        super().__init__(address, UpdateRequestHandler)
+
+    def process_request(self, request, client_address):
+        # Leave further connections in the backlog until a slot frees up
+        if not self.slots.acquire(blocking=False):
+            self.waiting += 1
+            self.slots.acquire()
+            self.waiting -= 1
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self.slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self.slots.release()
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-download are routine, not server errors
+        if isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)) or self.quiet:
+            return
+        super().handle_error(request, client_address)
@@ -6,9 +6,17 @@ Checks for updates and downloads them if available.
 
 import os
 import json
-import requests
-import shutil
 import sys
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from version_provider import VersionProvider
+from update_client import UpdateClient
+from downloader import download, DownloadError
+from checksums import file_sha256
+from compression import available_encodings
+from delta import apply_patch, find_patch_chain, DeltaError
 
 # Configuration
 # Replace this URL with your own update server URL
@@ -17,56 +25,182 @@ import sys
 UPDATE_URL = "http://localhost:8000/"
 VERSION_FILE = "version.json"
 GAME_EXE = "app.exe"
+TEMP_EXE = "temp_app.exe"  # Kept with its .state file between runs so downloads can resume
+TEMP_PATCH = "temp_update.patch"
+APP_DIR_PREFIX = "app-"  # Onedir installs live in app-<version>, version.json names the current one
+DOWNLOAD_WORKERS = 4  # Files of a onedir update downloaded at once
 
 # Load current version
-current_version = "1.0.0"
+current_version = VersionProvider(VERSION_FILE).get()
+use_onedir = "--onedir" in sys.argv  # Switch a single-exe install over to the onedir build
+launch = "--launch" in sys.argv  # Start the game once the update check is done
 
-try:
-    with open(VERSION_FILE, "r") as f:
-        version_data = json.load(f)
-        current_version = version_data.get("version", current_version)
-except FileNotFoundError:
-    pass
+# Always revalidate the manifest, the cached copy may be one the game saw hours ago
+update_client = UpdateClient(UPDATE_URL, cache_ttl=0)
 
 # Check for updates
 def check_for_updates():
     """Check if an update is available."""
     try:
-        response = requests.get(f"{UPDATE_URL}latest_version.json")
-        latest_version_data = response.json()
-        latest_version = latest_version_data.get("version", current_version)
-        
-        if latest_version > current_version:
-            return latest_version
-        else:
-            return None
+        return update_client.check_for_updates(current_version)
     except Exception as e:
         print(f"Error checking for updates: {e}")
         return None
 
+def full_download_size(manifest):
+    """Get the bytes a full download of the manifest's app.exe takes, in the smallest coding this install decodes."""
+    variants = manifest.get("variants", {})
+    return min([manifest.get("size", float("inf"))] + [variants[encoding] for encoding in available_encodings() if encoding in variants])
+
+def find_patches(manifest, latest_version):
+    """Get the cheapest chain of patches from the installed app.exe, if it beats a full download."""
+    if manifest.get("version") != latest_version or not os.path.exists(GAME_EXE):
+        return None
+    chain = find_patch_chain(manifest.get("patches", []), current_version, latest_version)
+    if not chain or sum(patch["size"] for patch in chain) >= full_download_size(manifest):
+        return None
+    return chain
+
+def apply_patches(chain):
+    """Rebuild the new app.exe into TEMP_EXE from the installed one, one patch at a time."""
+    # Progress saved by an earlier full download no longer describes TEMP_EXE
+    if os.path.exists(f"{TEMP_EXE}.state"):
+        os.remove(f"{TEMP_EXE}.state")
+    source = GAME_EXE
+    for step, patch in enumerate(chain):
+        print(f"Downloading patch {patch['from']} -> {patch['to']} ({patch['size']} bytes)...")
+        download(update_client, patch["file"], TEMP_PATCH, patch["sha256"])
+
+        # Alternate between two files so a step never overwrites its own source
+        output = TEMP_EXE if (len(chain) - step) % 2 == 1 else f"{TEMP_EXE}.step"
+        digest = apply_patch(source, TEMP_PATCH, output)
+        os.remove(TEMP_PATCH)
+        if source != GAME_EXE:
+            os.remove(source)
+        if digest != patch["target_sha256"]:
+            os.remove(output)
+            raise DeltaError(f"Patch to {patch['to']} produced the wrong file")
+        source = output
+
+def write_version(version, app_dir=None):
+    """Record the installed version, and the folder it lives in for onedir installs, in one step."""
+    data = {"version": version}
+    if app_dir:
+        data["app_dir"] = app_dir
+    with open(f"{VERSION_FILE}.tmp", "w") as f:
+        json.dump(data, f)
+    os.replace(f"{VERSION_FILE}.tmp", VERSION_FILE)
+
+def installed_app_dir():
+    """Get the folder of the current onedir install, or None for a single-exe install."""
+    try:
+        with open(VERSION_FILE, "r") as f:
+            app_dir = json.load(f).get("app_dir")
+    except (OSError, ValueError):
+        return None
+    return app_dir if app_dir and os.path.isdir(app_dir) else None
+
+def game_path():
+    app_dir = installed_app_dir()
+    return os.path.join(app_dir, GAME_EXE) if app_dir else GAME_EXE
+
+def file_matches(path, entry):
+    return os.path.isfile(path) and os.path.getsize(path) == entry["size"] and file_sha256(path) == entry["sha256"]
+
+def link_or_copy(source, target):
+    """Share an unchanged file with the previous install, copying it where hardlinks are not supported."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+def install_app_dir(onedir, latest_version):
+    """Build the new version's folder beside the current one, then switch version.json over to it.
+
+    Files the current install already has are reused, the rest are
+    downloaded into a .partial folder that survives an interrupted run.
+    Only the rewrite of version.json switches versions, so the game
+    always starts either the old folder or the complete new one.
+    """
+    current_dir = installed_app_dir()
+    target_dir = f"{APP_DIR_PREFIX}{latest_version}"
+    if target_dir == current_dir:
+        # Reinstalling the same version, the running folder cannot be replaced in place
+        target_dir = f"{target_dir}-{os.getpid()}"
+    staging_dir = f"{target_dir}.partial"
+
+    missing = []
+    reused = 0
+    for entry in onedir["files"]:
+        path = os.path.join(staging_dir, *entry["path"].split("/"))
+        if file_matches(path, entry):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        source = os.path.join(current_dir, *entry["path"].split("/")) if current_dir else None
+        if source and file_matches(source, entry):
+            if os.path.exists(path):
+                os.remove(path)
+            link_or_copy(source, path)
+            reused += 1
+        else:
+            missing.append((entry, path))
+
+    print(f"Reusing {reused} unchanged files, downloading {len(missing)}...")
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        for future in [executor.submit(download, update_client, entry["file"], path, entry["sha256"]) for entry, path in missing]:
+            future.result()
+
+    # Left over from an attempt that never got switched to
+    if os.path.exists(target_dir):
+        shutil.rmtree(target_dir)
+    os.replace(staging_dir, target_dir)
+    print("Applying update...")
+    write_version(latest_version, target_dir)
+
+    # Older folders may still be in use by a running game, they go on a later run then
+    for name in os.listdir("."):
+        if name.startswith(APP_DIR_PREFIX) and name != target_dir and os.path.isdir(name):
+            shutil.rmtree(name, ignore_errors=True)
+
 # Download and apply update
 def apply_update(latest_version):
     """Download and apply the latest update."""
     try:
-        print(f"Downloading update {latest_version}...")
-        
-        # Download the latest app.exe
-        update_response = requests.get(f"{UPDATE_URL}{latest_version}.exe", stream=True)
-        update_response.raise_for_status()
-        with open("temp_app.exe", "wb") as f:
-            for chunk in update_response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        manifest = update_client.manifest or {}
+        describes_latest = manifest.get("version") == latest_version
+        if describes_latest and "onedir" in manifest and (use_onedir or installed_app_dir()):
+            install_app_dir(manifest["onedir"], latest_version)
+            print("Update applied successfully!")
+            return True
+
+        sha256 = manifest.get("sha256") if describes_latest else None
+        # Releases that only changed the updater keep the same app.exe
+        if sha256 and os.path.exists(GAME_EXE) and file_sha256(GAME_EXE) == sha256:
+            print("app.exe is already up to date.")
+            write_version(latest_version)
+            return True
+
+        chain = find_patches(manifest, latest_version)
+        patched = False
+        if chain:
+            try:
+                apply_patches(chain)
+                patched = True
+            except (DownloadError, DeltaError, OSError) as e:
+                print(f"Patching failed ({e}), downloading the full update instead")
+
+        if not patched:
+            print(f"Downloading update {latest_version}...")
+
+            # Download the latest app.exe, checked against the manifest's hash when it has one
+            name = manifest.get("file", f"{latest_version}.exe") if describes_latest else f"{latest_version}.exe"
+            download(update_client, name, TEMP_EXE, sha256)
         
-        # Replace the old app.exe
+        # Replace the old app.exe in one step
         print("Applying update...")
-        if os.path.exists(GAME_EXE):
-            os.remove(GAME_EXE)
-        shutil.move("temp_app.exe", GAME_EXE)
+        os.replace(TEMP_EXE, GAME_EXE)
         
-        # Update version file
-        with open(VERSION_FILE, "w") as f:
-            json.dump({"version": latest_version}, f)
-
+        write_version(latest_version)
         print("Update applied successfully!")
         return True
     except Exception as e:
@@ -81,16 +215,18 @@ if __name__ == "__main__":
     if latest_version:
         print(f"Update available: {latest_version}")
         apply_update(latest_version)
-    elif not os.path.exists(GAME_EXE):
-        print(f"{GAME_EXE} not found. Downloading latest version...")
+    elif not os.path.exists(game_path()) or (use_onedir and not installed_app_dir()):
+        print(f"{game_path()} not found. Downloading latest version...")
         # Fetch latest version again or assume current_version is latest? Wait, if no update, but exe missing, perhaps download anyway.
         # Since check_for_updates fetches latest, and if not > current, but exe missing, download latest.
         try:
-            response = requests.get(f"{UPDATE_URL}latest_version.json")
-            latest_version_data = response.json()
-            latest_version = latest_version_data.get("version", current_version)
+            latest_version = update_client.get_manifest().get("version", current_version)
             apply_update(latest_version)
         except Exception as e:
             print(f"Error downloading: {e}")
     else:
-        print("No updates available.")
\ No newline at end of file
+        print("No updates available.")
+
+    if launch:
+        # From this folder, where the game finds version.json
+        subprocess.Popen([os.path.abspath(game_path())])
\ No newline at end of file
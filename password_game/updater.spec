@@ -10,7 +10,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['numpy'],  # Only the patch builder uses it, see build_executables.py
     noarchive=False,
     optimize=0,
 )
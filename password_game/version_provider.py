@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Version Provider for Project Zozfil
+Loads version.json once and only re-reads it when the file changes on disk.
+"""
+
+import os
+import json
+import time
+
+# Configuration
+VERSION_FILE = "version.json"
+DEFAULT_VERSION = "1.0.0"
+CHECK_INTERVAL = 5.0  # Seconds between mtime checks
+
+class VersionProvider:
+    """Cached view of the installed version."""
+
+    def __init__(self, path=VERSION_FILE, default=DEFAULT_VERSION, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.default = default
+        self.check_interval = check_interval
+        self.version = default
+        self.mtime = None
+        self.last_check = time.monotonic()
+        self.refresh()
+
+    def get(self):
+        """Get the current version, checking the file at most every check_interval seconds."""
+        now = time.monotonic()
+        if now - self.last_check >= self.check_interval:
+            self.last_check = now
+            self.refresh()
+        return self.version
+
+    def refresh(self):
+        """Reload the version file if its mtime changed."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if mtime == self.mtime:
+            return
+        self.mtime = mtime
+
+        if mtime is None:
+            self.version = self.default
+            return
+        try:
+            with open(self.path, "r") as f:
+                version_data = json.load(f)
+            self.version = version_data.get("version", self.default)
+        except (OSError, ValueError):
+            # Half-written file, keep the last good version until the next change
+            self.mtime = None